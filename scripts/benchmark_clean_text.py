@@ -0,0 +1,37 @@
+import argparse
+import random
+import time
+import pandas as pd
+from src.data.preprocess_data import clean_text, clean_text_series
+
+WORDS = ["the", "food", "was", "GREAT", "service", "slow", "très", "bon", "enak", "sekali", "美味しい",
+         "price", "5/5", "would", "come", "back!!", "staff", "rude...", "clean", "toilets", "😀", "n'est", "pas"]
+EXTRAS = ["http://promo.example.com/deal?x=1", "www.shop.sg", "#1", "$$$", "(ok)", "\n", "\t"]
+
+
+def synthetic_reviews(n, seed=42):
+    rng = random.Random(seed)
+    vocab = WORDS * 4 + EXTRAS
+    return pd.Series([" ".join(rng.choices(vocab, k=rng.randint(3, 60))) for _ in range(n)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare clean_text via Series.apply with clean_text_series.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    texts = synthetic_reviews(args.rows)
+    print(f"🧪 {len(texts):,} synthetic reviews, {texts.str.len().sum() / 1e6:.0f}M characters")
+
+    start = time.perf_counter()
+    expected = texts.apply(clean_text)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = clean_text_series(texts)
+    series_seconds = time.perf_counter() - start
+
+    if not expected.equals(actual):
+        raise SystemExit("❌ clean_text_series output differs from clean_text")
+    print(f"⏱️ apply(clean_text): {apply_seconds:.2f}s, clean_text_series: {series_seconds:.2f}s")
+    print(f"✅ Identical output, x{apply_seconds / series_seconds:.1f} faster")
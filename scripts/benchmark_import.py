@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Runs in a fresh interpreter so nothing is already imported or loaded
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def measure(module, cwd, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE, module], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        "median_seconds": statistics.median(s["seconds"] for s in samples),
+        "max_rss_mb": max(s["max_rss_mb"] for s in samples),
+        "runs": runs,
+    }
+
+
+def measure_ref(module, ref, runs):
+    # same measurement on another commit, checked out into a throwaway worktree
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree")
+        subprocess.run(["git", "worktree", "add", "--detach", path, ref], check=True, capture_output=True)
+        try:
+            return measure(module, path, runs)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", path], check=True, capture_output=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the cold import time and memory of a module.")
+    parser.add_argument("--module", default="src.api.app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline-ref", help="git ref to compare against, e.g. the commit before lazy loading")
+    args = parser.parse_args()
+
+    current = measure(args.module, os.getcwd(), args.runs)
+    print(f"⏱️ {args.module}: {current['median_seconds']:.2f}s median import, {current['max_rss_mb']:.0f} MB peak RSS")
+
+    if args.baseline_ref:
+        baseline = measure_ref(args.module, args.baseline_ref, args.runs)
+        print(f"⏱️ {args.module} @ {args.baseline_ref}: {baseline['median_seconds']:.2f}s median import, "
+              f"{baseline['max_rss_mb']:.0f} MB peak RSS")
+        print(f"✅ x{baseline['median_seconds'] / current['median_seconds']:.1f} faster, "
+              f"{baseline['max_rss_mb'] - current['max_rss_mb']:.0f} MB less memory")
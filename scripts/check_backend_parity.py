@@ -0,0 +1,25 @@
+import argparse
+import json
+import pandas as pd
+from src.models.backends import load_zero_shot_backend, check_parity, ZERO_SHOT_BACKENDS
+from src.models.registry import ZERO_SHOT_MODEL
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare a CPU zero-shot backend against the fp32 reference.")
+    parser.add_argument("--backend", choices=ZERO_SHOT_BACKENDS, default="int8")
+    parser.add_argument("--input", default="src/data/processed/final_features.csv")
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    texts = df["text_en"].dropna().sample(min(args.sample, df["text_en"].notna().sum()), random_state=42).tolist()
+
+    reference = load_zero_shot_backend(ZERO_SHOT_MODEL, "torch")
+    candidate = load_zero_shot_backend(ZERO_SHOT_MODEL, args.backend)
+    report = check_parity(texts, candidate, reference, tolerance=args.tolerance)
+
+    print(json.dumps(report, indent=2))
+    status = "✅" if report["within_tolerance"] else "❌"
+    print(f"{status} {args.backend}: max flip rate {report['max_flip_rate']:.2%} (tolerance {args.tolerance:.2%}), "
+          f"speedup x{report['speedup']:.2f}")
@@ -0,0 +1,29 @@
+import argparse
+import json
+import pandas as pd
+from src.policy.policy_enforcer import PolicyEnforcer
+from src.models.distill import distill_policies, save_distilled, DISTILLED_DIR
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distill zero-shot policy verdicts into fast classical models.")
+    parser.add_argument("--input", default="src/data/processed/final_features.csv")
+    parser.add_argument("--output", default=DISTILLED_DIR)
+    parser.add_argument("--sample", type=int, default=None, help="label at most this many reviews with the teacher")
+    parser.add_argument("--threshold", type=float, default=0.9, help="confidence needed to skip the teacher")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    texts = df["text_en"].dropna().astype(str)
+    if args.sample:
+        texts = texts.sample(min(args.sample, len(texts)), random_state=42)
+    texts = texts.tolist()
+
+    # Teacher labels from the zero-shot model
+    teacher = PolicyEnforcer(use_zero_shot=True)
+    teacher_flags = teacher.check_zero_shot_multi(texts)
+
+    models, reports = distill_policies(texts, teacher_flags, threshold=args.threshold)
+    save_distilled(models, args.output)
+
+    print(json.dumps(reports, indent=2))
+    print(f"✅ Distilled models saved to {args.output}")
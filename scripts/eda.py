@@ -4,13 +4,13 @@ import seaborn as sns
 import numpy as np
 from collections import Counter
 import re
-from src.data.preprocess_data import clean_text, detect_lang
+from src.data.preprocess_data import clean_text_series, detect_lang_series
 import nltk as nltk
 nltk.download('stopwords')
 
 df = pd.read_csv("src/data/data_sources/KaggleReviews.csv")
-df['text'] = df['text'].apply(clean_text)
-df['language'] = df['text'].apply(detect_lang)
+df['text'] = clean_text_series(df['text'])
+df['language'] = detect_lang_series(df['text'])
 
 sns.set(style="whitegrid")
 plt.style.use("seaborn-v0_8-whitegrid")
@@ -1,17 +1,36 @@
+import argparse
+import os
 import pandas as pd
 from src.policy.policy_enforcer import PolicyEnforcer
+from src.policy.verdict_cache import VerdictCache
+from src.policy.near_duplicates import NearDuplicateIndex, STREAM_INDEX_PATH, STREAM_WINDOW
 
 if __name__ == "__main__":
-    # Load review data
-    df = pd.read_csv("src/data/processed/final_features.csv")
-    df = df.head(100)
+    parser = argparse.ArgumentParser(description="Enforce review policies over a feature CSV, chunk by chunk.")
+    parser.add_argument("--input", default="src/data/processed/final_features.csv")
+    parser.add_argument("--output", default="src/data/processed/enforced_reviews.csv")
+    parser.add_argument("--chunksize", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1, help="processes for the rule checks")
+    parser.add_argument("--duplicate-window", type=int, default=STREAM_WINDOW,
+                        help="newest reviews kept in the near-duplicate index (0 keeps all)")
+    parser.add_argument("--duplicate-index", default=STREAM_INDEX_PATH,
+                        help="near-duplicate index carried across runs (separate from the API's)")
+    args = parser.parse_args()
 
     # Instantiate enforcer
-    enforcer = PolicyEnforcer(use_zero_shot=True)
+    duplicate_index = NearDuplicateIndex.load(args.duplicate_index, max_documents=args.duplicate_window or None)
+    enforcer = PolicyEnforcer(use_zero_shot=True, cache=VerdictCache(), duplicate_index=duplicate_index, workers=args.workers)
 
-    # Apply enforcement
-    df_enforced = enforcer.enforce(df)
+    # Stream review data through the enforcer, appending each chunk to the output
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    total = flagged = 0
+    chunks = pd.read_csv(args.input, chunksize=args.chunksize)
+    for i, df_enforced in enumerate(enforcer.enforce_iter(chunks)):
+        df_enforced.to_csv(args.output, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        total += len(df_enforced)
+        flagged += int(df_enforced["has_violation"].sum())
+        print(f"🔄 Chunk {i + 1}: {total} reviews enforced, {flagged} flagged")
 
-    # Save results
-    df_enforced.to_csv("src/data/processed/enforced_reviews.csv", index=False)
-    print("✅ Enforcement complete. Output saved to enforced_reviews.csv")
+    duplicate_index.save(args.duplicate_index)
+    print(f"✅ Enforcement complete. Output saved to {args.output}")
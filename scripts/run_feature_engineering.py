@@ -1,20 +1,81 @@
 import pandas as pd
+import argparse
 from src.features.text_feats import extract_text_features
-from src.features.metadata_feats import extract_metadata_features
+from src.features.metadata_feats import extract_metadata_features, encode_categories
+from src.features.tfidf import TfidfFeaturizer, save_tfidf_matrix, DEFAULT_TFIDF_PATH
+from src.features.feature_store import FeatureStore, feature_version, review_keys, content_hashes
 
-def create_feature_dataset(input_csv, output_csv):
+def create_feature_dataset(input_csv, output_csv, tfidf_path=DEFAULT_TFIDF_PATH, refit_tfidf=False, tfidf_max_features=50):
+    """Builds the feature table. TF-IDF goes to <output>.tfidf.npz, one row per table row.
+
+    The saved TF-IDF featurizer only transforms; it is fitted (and saved) when none
+    exists yet or `refit_tfidf` is set.
+    """
     df = pd.read_csv(input_csv)
 
     print("🔎 Columns in loaded CSV:", list(df.columns))
 
+    featurizer = TfidfFeaturizer.load(tfidf_path, max_features=tfidf_max_features)
+    if refit_tfidf or not featurizer.fitted:
+        featurizer = TfidfFeaturizer(max_features=tfidf_max_features, path=tfidf_path).fit(df["text_en"])
+        featurizer.save()
+        print(f"✅ TF-IDF featurizer fitted ({len(featurizer.feature_names)} terms) and saved to {tfidf_path}")
+
     # Apply feature extraction
-    df = extract_text_features(df)
+    df, tfidf_matrix = extract_text_features(df, featurizer=featurizer)
     print("🔎 Columns in loaded CSV:", list(df.columns))
     df = extract_metadata_features(df)
 
     # Save final dataset with all features
     df.to_csv(output_csv, index=False)
-    print(f"✅ Feature dataset saved to {output_csv}")
+    npz_path = save_tfidf_matrix(tfidf_matrix, output_csv)
+    print(f"✅ Feature dataset saved to {output_csv} (TF-IDF matrix in {npz_path})")
+
+def update_feature_store(input_csv, store: FeatureStore = None, tfidf_path=DEFAULT_TFIDF_PATH, tfidf_max_features=50):
+    """Computes features only for reviews that are new or changed since the store last saw them.
+
+    Rows are keyed by review_id and stored per feature version (FEATURE_VERSION plus
+    the TF-IDF vocabulary), so a new version recomputes everything once.
+    """
+    if store is None:
+        store = FeatureStore()
+    df = pd.read_csv(input_csv)
+
+    featurizer = TfidfFeaturizer.load(tfidf_path, max_features=tfidf_max_features)
+    if not featurizer.fitted:
+        featurizer.fit(df["text_en"])
+        featurizer.save()
+        print(f"✅ TF-IDF featurizer fitted ({len(featurizer.feature_names)} terms) and saved to {tfidf_path}")
+    version = feature_version(featurizer)
+    store.activate_version(version, featurizer.feature_names)
+
+    keys = review_keys(df)
+    hashes = content_hashes(df)
+    stale = pd.Series(store.stale(keys, hashes, version), index=df.index)
+    # duplicated review_ids: the last row wins, as it would in a full rebuild
+    stale &= ~pd.Series(keys, index=df.index).duplicated(keep="last")
+
+    todo = df[stale]
+    if len(todo):
+        features, tfidf_matrix = extract_text_features(todo.copy(), featurizer=featurizer)
+        features = extract_metadata_features(features)
+        store.put([k for k, s in zip(keys, stale) if s], [h for h, s in zip(hashes, stale) if s], features, tfidf_matrix, version)
+    print(f"✅ Feature store {version}: {len(todo)} of {len(df)} reviews computed, {len(df) - len(todo)} reused")
+    return {"version": version, "rows": len(df), "computed": len(todo)}
+
+def load_feature_dataset(store: FeatureStore, business_name=None):
+    """Feature rows served from the store, with batch-relative category codes recomputed over them."""
+    features, tfidf_matrix = store.get(business_name)
+    if len(features):
+        features = encode_categories(features)
+    return features, tfidf_matrix
 
 if __name__ == "__main__":
-    create_feature_dataset("src/data/processed/KaggleReviews_processed.csv", "src/data/processed/final_features.csv")
+    parser = argparse.ArgumentParser(description="Build the feature table from preprocessed reviews.")
+    parser.add_argument("--input", default="src/data/processed/KaggleReviews_processed.csv")
+    parser.add_argument("--output", default="src/data/processed/final_features.csv")
+    parser.add_argument("--refit-tfidf", action="store_true", help="fit a new TF-IDF vocabulary instead of reusing the saved one")
+    parser.add_argument("--tfidf-max-features", type=int, default=50)
+    args = parser.parse_args()
+
+    create_feature_dataset(args.input, args.output, refit_tfidf=args.refit_tfidf, tfidf_max_features=args.tfidf_max_features)
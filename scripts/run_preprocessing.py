@@ -1,26 +1,109 @@
 import pandas as pd
+import argparse
+import itertools
+import json
 import os
-from src.data.preprocess_data import clean_text, detect_lang, translate_to_english
+from src.data.preprocess_data import clean_text_series, detect_lang_series, translate_batch
+from src.data.translation_cache import TranslationCache
 
-def run_preprocessing(input_path: str, output_path: str):
-    try:
-        df = pd.read_csv(input_path)
-    except FileNotFoundError:
+def preprocess_frame(df: pd.DataFrame, batch_size: int = 16, max_length: int = 256, cache: TranslationCache = None, workers: int = None) -> pd.DataFrame:
+    df['text'] = clean_text_series(df['text'])
+    df['language'] = detect_lang_series(df['text'], workers=workers)
+    df['text_en'] = translate_batch(df['text'].tolist(), df['language'].tolist(), batch_size=batch_size, max_length=max_length, cache=cache)
+    df['review_length'] = df['text_en'].apply(lambda x: len(str(x).split()))
+    return df
+
+def _input_fingerprint(input_path: str, chunksize: int) -> dict:
+    stat = os.stat(input_path)
+    return {"input": os.path.abspath(input_path), "size": stat.st_size, "mtime": stat.st_mtime, "chunksize": chunksize}
+
+def _load_checkpoint(checkpoint_path: str, fingerprint: dict) -> dict:
+    if not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("fingerprint") != fingerprint:
+        print("⚠️ Checkpoint is for a different input or chunk size, starting over.")
+        return None
+    return checkpoint
+
+def _save_checkpoint(checkpoint_path: str, checkpoint: dict):
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+def run_preprocessing(input_path: str, output_path: str, batch_size: int = 16, max_length: int = 256, cache: TranslationCache = None,
+                      workers: int = None, chunksize: int = None, resume: bool = True):
+    """Cleans, language-tags and translates the reviews in `input_path`.
+
+    With `chunksize`, the input is streamed in chunks of that many rows. Each chunk
+    is appended to the output and recorded in `<output_path>.checkpoint`. A rerun
+    after a crash resumes after the last completed chunk.
+    """
+    if not os.path.exists(input_path):
         print(f"❌ Error: The file {input_path} was not found.")
         return
 
     print("🚀 Starting data preprocessing...")
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if cache is None:
+        cache = TranslationCache()
+    hits, misses = cache.hits, cache.misses
 
-    df['text'] = df['text'].apply(clean_text)
-    df['language'] = df['text'].apply(detect_lang)
-    df['text_en'] = df.apply(lambda row: translate_to_english(row['text'], row['language']), axis=1)
-    df['review_length'] = df['text_en'].apply(lambda x: len(str(x).split()))
+    if chunksize is None:
+        df = preprocess_frame(pd.read_csv(input_path), batch_size, max_length, cache, workers)
+        df.to_csv(output_path, index=False)
+    else:
+        _run_chunked(input_path, output_path, chunksize, resume, batch_size=batch_size, max_length=max_length, cache=cache, workers=workers)
+
+    hits, misses = cache.hits - hits, cache.misses - misses
+    print(f"🗂️ Translation cache: {hits} hits / {misses} misses "
+          f"({hits / max(hits + misses, 1):.1%} hit rate, {len(cache)} entries)")
+
+def _run_chunked(input_path: str, output_path: str, chunksize: int, resume: bool, **kwargs):
+    checkpoint_path = f"{output_path}.checkpoint"
+    fingerprint = _input_fingerprint(input_path, chunksize)
+    checkpoint = _load_checkpoint(checkpoint_path, fingerprint) if resume else None
+    if checkpoint is None or not os.path.exists(output_path):
+        checkpoint = {"fingerprint": fingerprint, "chunks": 0, "rows": 0, "output_bytes": 0}
+    else:
+        # drop whatever a crashed chunk appended after the last checkpoint
+        with open(output_path, "r+b") as f:
+            f.truncate(checkpoint["output_bytes"])
+        print(f"⏩ Resuming after chunk {checkpoint['chunks']} ({checkpoint['rows']} rows done)")
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    df.to_csv(output_path, index=False)
+    # completed chunks are re-read but not reprocessed; skipping whole chunks rather
+    # than lines keeps boundaries right when quoted reviews span several lines
+    chunks = pd.read_csv(input_path, chunksize=chunksize)
+    for df in itertools.islice(chunks, checkpoint["chunks"], None):
+        df = preprocess_frame(df, **kwargs)
+        first = checkpoint["chunks"] == 0
+        with open(output_path, "w" if first else "a", newline="") as f:
+            df.to_csv(f, header=first, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        checkpoint["chunks"] += 1
+        checkpoint["rows"] += len(df)
+        checkpoint["output_bytes"] = os.path.getsize(output_path)
+        _save_checkpoint(checkpoint_path, checkpoint)
+        print(f"🔄 Chunk {checkpoint['chunks']}: {checkpoint['rows']} reviews preprocessed")
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    print(f"✅ Preprocessing complete. Output saved to {output_path}")
 
 if __name__ == "__main__":
-    raw_data_path = "src/data/data_sources/KaggleReviews.csv"
-    processed_data_path = "src/data/processed/KaggleReviews_processed.csv"
-    run_preprocessing(raw_data_path, processed_data_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Clean, language-tag and translate raw reviews.")
+    parser.add_argument("--input", default="src/data/data_sources/KaggleReviews.csv")
+    parser.add_argument("--output", default="src/data/processed/KaggleReviews_processed.csv")
+    parser.add_argument("--chunksize", type=int, default=None, help="stream the input in chunks of this many rows, with checkpoints")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing checkpoint and start over")
+    parser.add_argument("--batch-size", type=int, default=16, help="translation batch size")
+    parser.add_argument("--max-length", type=int, default=256, help="max generated tokens per translation")
+    parser.add_argument("--workers", type=int, default=None, help="processes for language detection")
+    args = parser.parse_args()
+
+    run_preprocessing(args.input, args.output, batch_size=args.batch_size, max_length=args.max_length,
+                      workers=args.workers, chunksize=args.chunksize, resume=not args.no_resume)
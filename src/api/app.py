@@ -1,7 +1,7 @@
-from fastapi import FastAPI, Body, HTTPException
+from fastapi import FastAPI, Body, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional, List, Dict, Any
-import uuid, os, random
+import uuid, os, random, threading
 import pandas as pd
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -9,9 +9,13 @@ from pydantic import BaseModel, Field
 from src.data.schema import User, Place
 from src.data.ingest import ingest_scraped_data
 from scripts.run_preprocessing import run_preprocessing as preprocess_reviews
-from scripts.run_feature_engineering import create_feature_dataset as feature_engineer_reviews
+from scripts.run_feature_engineering import update_feature_store as feature_engineer_reviews, load_feature_dataset
 from src.policy.policy_enforcer import PolicyEnforcer
 from src.eval.evaluate import evaluate_model
+from src.models.registry import registry
+from src.policy.verdict_cache import VerdictCache
+from src.policy.near_duplicates import NearDuplicateIndex
+from src.features.feature_store import FeatureStore
 
 
 # --- API Specific Models (to handle request/response) ---
@@ -75,6 +79,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Verdicts persist across requests and restarts; unchanged reviews skip re-inference
+verdict_cache = VerdictCache()
+# Near-duplicate index grows across requests so copy-paste spam is caught between businesses.
+# It is read at startup (or by the first request), not at import; see get_duplicate_index
+_duplicate_index = None
+_duplicate_index_lock = threading.Lock()
+# Features per review_id; each request only computes the reviews that are new or changed
+feature_store = FeatureStore()
+
+
+def get_duplicate_index() -> NearDuplicateIndex:
+    global _duplicate_index
+    with _duplicate_index_lock:
+        if _duplicate_index is None:
+            _duplicate_index = NearDuplicateIndex.load()
+        return _duplicate_index
+
+
+def save_duplicate_index():
+    # Run as a background task after the response; only writes the reviews added or merged since the last save
+    index = get_duplicate_index()
+    if index.changed:
+        index.save()
+
+# --- Model Lifecycle ---
+
+@app.on_event("startup")
+def warm_models():
+    # Set PRELOAD_MODELS=0 to defer loading to the first request that needs a model
+    if os.getenv("PRELOAD_MODELS", "1") != "0":
+        registry.preload()
+        get_duplicate_index()
+
+@app.get("/api/ready")
+def ready() -> Dict[str, Any]:
+    status = registry.status()
+    if not registry.is_ready():
+        raise HTTPException(status_code=503, detail={"ready": False, "models": status})
+    return {"ready": True, "models": status}
+
+@app.post("/api/models/reload")
+def reload_models(name: Optional[str] = Body(None, embed=True)) -> Dict[str, Any]:
+    try:
+        registry.reload(name)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"ready": registry.is_ready(), "models": registry.status()}
+
 # --- API Endpoints ---
 
 @app.post("/api/load_data")
@@ -151,22 +203,20 @@ def preprocess_data(business_name: str = Body(..., embed=True), location: Option
 @app.post("/api/feature_engineer")
 def feature_engineer(business_name: str = Body(..., embed=True), location: Optional[str] = Body(None, embed=True)) -> List[Review]:
     input_path = "src/data/processed/GoogleMapReviews_processed.csv"
-    output_path = "src/data/processed/GoogleMapReviews_featured.csv"
     
     if not os.path.exists(input_path):
         raise HTTPException(status_code=404, detail="Preprocessed data not found. Please run '/api/preprocess' first.")
 
-    feature_engineer_reviews(input_path, output_path)
+    feature_engineer_reviews(input_path, store=feature_store)
 
     try:
-        df = pd.read_csv(output_path)
+        df, _ = load_feature_dataset(feature_store, business_name)
         if 'place_id' in df.columns:
             df['place_id'] = df['place_id'].astype(str)
         if 'user_id' in df.columns:
             df['user_id'] = df['user_id'].astype(str)
         if 'review_id' in df.columns:
             df['review_id'] = df['review_id'].astype(str)
-        df = df[df['business_name'].str.contains(business_name, case=False, na=False)]
         engineered_reviews = [Review(**row) for row in df.to_dict('records')]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read feature engineered data from CSV: {str(e)}")
@@ -174,15 +224,13 @@ def feature_engineer(business_name: str = Body(..., embed=True), location: Optio
     return engineered_reviews
 
 @app.post("/api/enforce_policies")
-def enforce_policies(business_name: str = Body(..., embed=True), location: Optional[str] = Body(None, embed=True)) -> PolicyAnalysisSummary:
-    input_path = "src/data/processed/GoogleMapReviews_featured.csv"
-
-    if not os.path.exists(input_path):
+def enforce_policies(background_tasks: BackgroundTasks, business_name: str = Body(..., embed=True), location: Optional[str] = Body(None, embed=True)) -> PolicyAnalysisSummary:
+    if not len(feature_store):
         raise HTTPException(status_code=404, detail="Feature engineered data not found. Please run '/api/feature_engineer' first.")
     
     try:
         # Load the feature-engineered data
-        df = pd.read_csv(input_path)
+        df, _ = load_feature_dataset(feature_store, business_name)
         if 'place_id' in df.columns:
             df['place_id'] = df['place_id'].astype(str)
         if 'user_id' in df.columns:
@@ -190,7 +238,8 @@ def enforce_policies(business_name: str = Body(..., embed=True), location: Optio
         if 'review_id' in df.columns:
             df['review_id'] = df['review_id'].astype(str)
 
-        df = df[df['business_name'].str.contains(business_name, case=False, na=False)]
+        if df.empty:
+            raise HTTPException(status_code=404, detail="No feature-engineered reviews found for the specified business.")
         df['sentiment_label'] = df['sentiment_polarity'].apply(
             lambda x: 'positive' if x > 0 else ('negative' if x < 0 else 'neutral')
         )
@@ -207,8 +256,14 @@ def enforce_policies(business_name: str = Body(..., embed=True), location: Optio
             return df
         
         # Instantiate and apply the policy enforcer
-        enforcer = PolicyEnforcer(use_zero_shot=True)
+        enforcer = PolicyEnforcer(
+            use_zero_shot=True,
+            cache=verdict_cache,
+            distilled_models=registry.get("distilled"),
+            duplicate_index=get_duplicate_index(),
+        )
         df_enforced = enforcer.enforce(df)
+        background_tasks.add_task(save_duplicate_index)
         df_enforced = add_policy_violation_types(df_enforced)
 
         # Extract policy analysis summary
@@ -235,25 +290,30 @@ def enforce_policies(business_name: str = Body(..., embed=True), location: Optio
         )
 
         return summary
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to perform policy enforcement: {str(e)}")
     
 @app.post("/api/evaluate")
-def evaluate_endpoint(request: EvaluationRequest) -> EvaluationResponse:
-    input_path = "src/data/processed/GoogleMapReviews_featured.csv"
-
-    if not os.path.exists(input_path):
+def evaluate_endpoint(request: EvaluationRequest, background_tasks: BackgroundTasks) -> EvaluationResponse:
+    if not len(feature_store):
         raise HTTPException(status_code=404, detail="Feature engineered data not found. Please run '/api/feature_engineer' first.")
     
     try:
-        df = pd.read_csv(input_path)
-        df = df[df['business_name'].str.contains(request.business_name, case=False, na=False)]
+        df, _ = load_feature_dataset(feature_store, request.business_name)
         
         if df.empty:
             raise HTTPException(status_code=404, detail="No feature-engineered reviews found for the specified business.")
 
-        enforcer = PolicyEnforcer(use_zero_shot=True)
+        enforcer = PolicyEnforcer(
+            use_zero_shot=True,
+            cache=verdict_cache,
+            distilled_models=registry.get("distilled"),
+            duplicate_index=get_duplicate_index(),
+        )
         df_enforced = enforcer.enforce(df)
+        background_tasks.add_task(save_duplicate_index)
 
         predictions = df_enforced['has_violation'].tolist()
 
@@ -262,5 +322,7 @@ def evaluate_endpoint(request: EvaluationRequest) -> EvaluationResponse:
         report = evaluate_model(predictions, true_labels)
         
         return EvaluationResponse(**report)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to perform model evaluation: {str(e)}")
\ No newline at end of file
@@ -18,7 +18,7 @@ import hashlib
 
 from src.data.schema import Review, User, Place
 from src.data.db import reviews_collection, users_collection, places_collection
-from src.data.preprocess_data import clean_text, detect_lang
+from src.data.preprocess_data import clean_text_series, detect_lang_series
 from src.data.scrape_google_reviews import *
 
 def get_chrome_driver():
@@ -125,15 +125,13 @@ def insert_place(data: dict):
 
 def ingest_reviews_csv(csv_path: str, source: Optional[str] = None):
     df = pd.read_csv(csv_path)
+    cleaned_texts = clean_text_series(df["text"] if "text" in df else pd.Series("", index=df.index))
+    languages = detect_lang_series(cleaned_texts)
 
-    for _, row in df.iterrows():
+    for (_, row), cleaned_text, detected_language in zip(df.iterrows(), cleaned_texts, languages):
         review_id = str(uuid.uuid4())
         place_id = str(hash(row.get("business_name"))) if pd.notna(row.get("business_name")) else None
         
-        raw_text = row.get("text", "")
-        cleaned_text = clean_text(raw_text)
-        detected_language = detect_lang(cleaned_text)
-        
         data = {
             "review_id": review_id,
             "place_id": place_id,
@@ -205,13 +203,11 @@ def ingest_scraped_data(business_name: str, location: Optional[str] = None, max_
                 continue
 
             # Ingest each scraped review
-            for r in scraped_reviews:
+            cleaned_texts = clean_text_series(pd.Series([r.get("text", "") for r in scraped_reviews], dtype=object))
+            languages = detect_lang_series(cleaned_texts, workers=1)
+            for r, cleaned_text, detected_language in zip(scraped_reviews, cleaned_texts, languages):
                 review_id = str(uuid.uuid4())
                 user_id = str(uuid.uuid4())
-                
-                raw_text = r.get("text", "")
-                cleaned_text = clean_text(raw_text)
-                detected_language = detect_lang(cleaned_text)
 
                 review_data = {
                     "review_id": review_id,
@@ -1,10 +1,23 @@
-import re, langid
+import re, os, langid
+import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+from src.models.registry import registry, TRANSLATION_MODEL
+from src.data.translation_cache import TranslationCache
 
-MODEL_NAME = "facebook/m2m100_418M"
-tokenizer = M2M100Tokenizer.from_pretrained(MODEL_NAME)
-model = M2M100ForConditionalGeneration.from_pretrained(MODEL_NAME)
+# The translator is loaded on first use (or by preload_translator), not at import:
+# clean_text/detect_lang callers never pay for the 418M-parameter model.
+MODEL_NAME = TRANSLATION_MODEL
+
+
+def get_translator():
+    """(tokenizer, model), loaded once per process; concurrent first calls share one load."""
+    return registry.get("translator")
+
+
+def preload_translator() -> None:
+    get_translator()
 
 LANG_CODE_MAP = {
     "en": "en",  # English
@@ -24,22 +37,174 @@ def clean_text(text: str) -> str:
     text = re.sub(r"[^a-z0-9\s]", " ", text)
     return re.sub(r"\s+", " ", text).strip()
 
+# clean_text_series works on many reviews joined by \x00, which no pattern touches
+_CLEAN_SEPARATOR = "\x00"
+_URL_PATTERN = re.compile(r"(?:http|www)[^\s\x00]+")
+# byte table keeping [a-z0-9] and the separator, every other byte becomes a space
+_KEEP_BYTES = set(b"abcdefghijklmnopqrstuvwxyz0123456789\x00")
+_CLEAN_TABLE = bytes(c if c in _KEEP_BYTES else ord(" ") for c in range(256))
+
+def clean_text_series(texts: pd.Series, chunk_size: int = 100_000) -> pd.Series:
+    """Column version of clean_text with byte-identical output for every string.
+
+    Each chunk of reviews is joined into one string, lower-cased and stripped of URLs
+    in one regex pass. Everything outside [a-z0-9] then becomes a space in a single
+    bytes.translate (non-ASCII characters are first encoded as "?"). The per-row
+    work left is collapsing spaces. Non-string values (NaN) are returned unchanged.
+    """
+    texts = pd.Series(texts)
+    is_str = texts.map(lambda t: isinstance(t, str)).to_numpy(dtype=bool)
+    values = texts[is_str].tolist()
+    cleaned = []
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        joined = _CLEAN_SEPARATOR.join(chunk)
+        if joined.count(_CLEAN_SEPARATOR) != len(chunk) - 1:
+            cleaned.extend(clean_text(t) for t in chunk)  # a review contains the separator itself
+            continue
+        joined = _URL_PATTERN.sub(" ", joined.lower())
+        joined = joined.encode("ascii", errors="replace").translate(_CLEAN_TABLE).decode("ascii")
+        cleaned.extend(" ".join(t.split()) for t in joined.split(_CLEAN_SEPARATOR))
+
+    values = texts.to_numpy(dtype=object, copy=True)
+    values[is_str] = cleaned
+    return pd.Series(values, index=texts.index, name=texts.name, dtype=texts.dtype)
+
 def detect_lang(text: str) -> str:
     lang, _ = langid.classify(text)
     return lang
 
-def translate_to_english(text: str, src_lang: str) -> str:
+# Frequent English words that are not also common words in the other languages we
+# see: no "a", "on", "was", "die", "de", "in", nor "is", "of", "at", "for" or "it"
+# (Dutch, Danish, and code-mixed Malay/Indonesian/French reviews use those too)
+ENGLISH_WORDS = {
+    "the", "and", "this", "that", "with", "very", "they", "were", "have", "had", "has",
+    "are", "but", "not", "my", "our", "you", "be", "their", "there", "would", "been",
+    "from", "just", "what", "which", "your", "when", "also", "will", "about", "because",
+    "could", "should", "than", "them", "these", "those", "here", "really", "only", "some",
+    "after", "before", "definitely", "again", "went", "got", "did", "didn't", "don't",
+    "it's", "i'm", "we're", "wasn't", "isn't", "food", "good", "great", "nice", "place",
+    "staff", "friendly", "delicious", "recommend", "amazing", "price", "prices", "time",
+    "ordered", "came", "back", "waited", "minutes", "worth", "love", "loved", "best",
+    "every", "always", "never", "little", "bit", "too", "much", "well",
+}
+_ASCII_WORD = re.compile(r"[a-z']+")
+
+def is_obviously_english(text: str, min_share: float = 0.5, min_words: int = 4) -> bool:
+    """Pure-ASCII text of at least `min_words` words, `min_share` of them known English words.
+
+    A share rather than a count, so a few English words mixed into an Indonesian,
+    Malay or French review do not make the whole review "English".
+    """
+    if not text.isascii():
+        return False
+    words = _ASCII_WORD.findall(text.lower())
+    if len(words) < min_words:
+        return False
+    return sum(word in ENGLISH_WORDS for word in words) >= min_share * len(words)
+
+def _detect_langs(texts: List[str]) -> List[str]:
+    return [detect_lang(text) for text in texts]
+
+def detect_lang_series(texts: pd.Series, workers: int = None, chunk_size: int = 5_000, min_share: float = 0.5) -> pd.Series:
+    """Column version of detect_lang, returning the same language codes.
+
+    Identical texts are classified once, obviously English texts skip langid, and
+    the remaining texts are classified across `workers` processes (default: all
+    cores; 1 runs in this process). Non-string values are classified as empty text.
+    """
+    texts = pd.Series(texts)
+    unique = list(dict.fromkeys(t if isinstance(t, str) else "" for t in texts))
+    langs = {text: "en" for text in unique if is_obviously_english(text, min_share)}
+    todo = [text for text in unique if text not in langs]
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [todo[start:start + chunk_size] for start in range(0, len(todo), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_detect_langs, chunks)
+            for chunk, chunk_langs in zip(chunks, results):
+                langs.update(zip(chunk, chunk_langs))
+    else:
+        langs.update(zip(todo, _detect_langs(todo)))
+
+    print(f"🌐 Language detection: {len(texts)} texts, {len(unique)} unique, "
+          f"{len(unique) - len(todo)} fast-path English, {len(todo)} classified")
+    return pd.Series([langs[t if isinstance(t, str) else ""] for t in texts], index=texts.index, name=texts.name)
+
+def translation_model_id(max_length=None) -> str:
+    # generation length is part of the id since it can truncate translations
+    return MODEL_NAME if max_length is None else f"{MODEL_NAME}@{max_length}"
+
+def translate_to_english(text: str, src_lang: str, cache=None) -> str:
     if src_lang == "en":
         return text  # no translation needed
     
     src_lang_m2m = LANG_CODE_MAP.get(src_lang, None)
     if not src_lang_m2m:
         return text
+
+    if cache is not None:
+        key = cache.make_key(text, src_lang_m2m, translation_model_id())
+        hit = cache.get_many([key])
+        if key in hit:
+            return hit[key]
     
+    tokenizer, model = get_translator()
     tokenizer.src_lang = src_lang_m2m
     encoded = tokenizer(text, return_tensors="pt")
     generated_tokens = model.generate(
         **encoded, 
         forced_bos_token_id=tokenizer.get_lang_id("en")
     )
-    return tokenizer.decode(generated_tokens[0], skip_special_tokens=True)
\ No newline at end of file
+    translation = tokenizer.decode(generated_tokens[0], skip_special_tokens=True)
+    if cache is not None:
+        cache.put_many({key: translation})
+    return translation
+
+def translate_batch(texts: List[str], src_langs: List[str], batch_size: int = 16, max_length: int = 256, cache=None) -> List[str]:
+    """Translates texts to English, one padded generate() call per batch of a source language.
+
+    Rows are grouped by language so `tokenizer.src_lang` is set once per group, and
+    sorted by length within a group to keep padding small. Output order matches input;
+    English and unsupported languages are returned unchanged. With a TranslationCache,
+    known texts are looked up and repeats within the batch are translated once.
+    """
+    texts = list(texts)
+    results = list(texts)
+    keys = {}                                  # row -> cache key (language + model + text)
+    model_id = translation_model_id(max_length)
+    for i, (text, lang) in enumerate(zip(texts, src_langs)):
+        src_lang_m2m = LANG_CODE_MAP.get(lang)
+        if lang != "en" and src_lang_m2m and isinstance(text, str) and text.strip():
+            keys[i] = TranslationCache.make_key(text, src_lang_m2m, model_id)
+
+    known = cache.get_many(list(keys.values())) if cache is not None and keys else {}
+    groups = defaultdict(dict)                 # language -> key -> first row with that key
+    for i, key in keys.items():
+        if key not in known:
+            groups[LANG_CODE_MAP[src_langs[i]]].setdefault(key, i)
+
+    if groups:
+        import torch
+
+        tokenizer, model = get_translator()
+        en_id = tokenizer.get_lang_id("en")
+        translated = {}
+        for src_lang_m2m, firsts in groups.items():
+            tokenizer.src_lang = src_lang_m2m
+            indices = sorted(firsts.values(), key=lambda i: len(texts[i]))
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start:start + batch_size]
+                encoded = tokenizer([texts[i] for i in batch], return_tensors="pt", padding=True, truncation=True)
+                with torch.inference_mode():
+                    generated_tokens = model.generate(**encoded, forced_bos_token_id=en_id, max_length=max_length)
+                decoded = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+                translated.update((keys[i], translation) for i, translation in zip(batch, decoded))
+        if cache is not None:
+            cache.put_many(translated)
+        known = {**known, **translated}
+
+    for i, key in keys.items():
+        results[i] = known[key]
+    return results
@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import threading
+import time
+
+# SQLite's default limit on host parameters is 999; lookups go in batches below it
+_IN_BATCH = 500
+
+
+def normalize_text(text) -> str:
+    return " ".join(str(text).split())
+
+
+class SQLiteStore:
+    """A SQLite file shared by every thread of the process, behind one lock.
+
+    `schema` statements run once on open. Subclasses hold `self._lock` around every
+    use of `self._conn`.
+    """
+
+    def __init__(self, path, schema=()):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        for statement in schema:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def _select_in(self, query, keys, params=()):
+        """Rows of `query` for every key, where `query` has an `IN ({placeholders})` clause.
+
+        `params` are bound before the keys. Call with the lock held.
+        """
+        rows = []
+        for start in range(0, len(keys), _IN_BATCH):
+            batch = keys[start:start + _IN_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(self._conn.execute(query.format(placeholders=placeholders), [*params, *batch]).fetchall())
+        return rows
+
+    def close(self):
+        self._conn.close()
+
+
+class LRUCache(SQLiteStore):
+    """Key -> value entries in one table, evicted least-recently-used once `max_entries` is exceeded.
+
+    Subclasses name the `table` and its `value_column`, and override `_encode`/`_decode`
+    for values that are not plain strings.
+    """
+
+    table = None
+    value_column = None
+
+    def __init__(self, path, max_entries):
+        super().__init__(path, [
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            f"(key TEXT PRIMARY KEY, {self.value_column} TEXT NOT NULL, last_access REAL NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS idx_{self.table}_access ON {self.table} (last_access)",
+        ])
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _encode(self, value):
+        return value
+
+    def _decode(self, stored):
+        return stored
+
+    def get_many(self, keys):
+        unique = list(dict.fromkeys(keys))
+        now = time.time()
+        with self._lock:
+            rows = self._select_in(
+                f"SELECT key, {self.value_column} FROM {self.table} WHERE key IN ({{placeholders}})", unique
+            )
+            found = {key: self._decode(value) for key, value in rows}
+            self._conn.executemany(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", [(now, k) for k in found])
+            self._conn.commit()
+        hits = sum(1 for k in keys if k in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, entries):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, last_access) VALUES (?, ?, ?)",
+                [(key, self._encode(value), now) for key, value in entries.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+        self.hits = self.misses = 0
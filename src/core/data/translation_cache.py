@@ -0,0 +1,24 @@
+import hashlib
+
+from src.data.sqlite_store import LRUCache, normalize_text
+
+DEFAULT_TRANSLATION_CACHE_PATH = "src/data/processed/translation_cache.sqlite"
+
+
+class TranslationCache(LRUCache):
+    """SQLite-backed memo of translations, shared across runs and businesses.
+
+    Keys hash the source language, the model and the whitespace-normalized text.
+    Entries are evicted least-recently-used once `max_entries` is exceeded.
+    """
+
+    table = "translations"
+    value_column = "translation"
+
+    def __init__(self, path=DEFAULT_TRANSLATION_CACHE_PATH, max_entries=200_000):
+        super().__init__(path, max_entries)
+
+    @staticmethod
+    def make_key(text, src_lang, model_id) -> str:
+        payload = "\x1f".join([str(src_lang), str(model_id), normalize_text(text)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
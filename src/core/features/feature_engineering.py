@@ -1,13 +1,11 @@
 import pandas as pd
 import re
-from textblob import TextBlob
-from gensim.models import LdaMulticore
-from gensim.corpora import Dictionary
-from gensim.parsing.preprocessing import STOPWORDS
 import numpy as np
 import os
+from src.features.topic_model import TopicModel, tokenize, DEFAULT_TOPIC_MODEL_DIR
+from src.features.sentiment import sentiment_frame, SENTIMENT_COLUMNS
 
-def run_feature_engineering(input_path: str, output_path: str):
+def run_feature_engineering(input_path: str, output_path: str, topic_model_dir: str = DEFAULT_TOPIC_MODEL_DIR, workers: int = 1):
     """
     Loads preprocessed data, creates new features, and saves the final DataFrame.
     """
@@ -35,27 +33,17 @@ def run_feature_engineering(input_path: str, output_path: str):
         print("✅ Review length feature added.")
 
     # --- 1. Sentiment Analysis ---
-    df['sentiment_polarity'] = df['text'].apply(lambda x: TextBlob(x).sentiment.polarity)
-    df['sentiment_subjectivity'] = df['text'].apply(lambda x: TextBlob(x).sentiment.subjectivity)
+    df[SENTIMENT_COLUMNS] = sentiment_frame(df['text'], workers=workers)
     print("✅ Sentiment analysis features added.")
 
     # --- 2. Topic Modeling (LDA) ---
-    # Prepare data for LDA
-    processed_docs = df['text'].apply(lambda text: [word for word in text.split() if word not in STOPWORDS])
-    dictionary = Dictionary(processed_docs)
-    corpus = [dictionary.doc2bow(doc) for doc in processed_docs]
+    # The model persists between runs; only reviews it has not seen update it
+    processed_docs = [tokenize(text) for text in df['text']]
+    topic_model = TopicModel.load(path=topic_model_dir, num_topics=3)  # num_topics only applies to a new model
+    topic_model.update(processed_docs)
+    topic_model.save()
 
-    # Train the LDA model
-    num_topics = 3 # Adjust this number based on your domain
-    lda_model = LdaMulticore(corpus=corpus, id2word=dictionary, num_topics=num_topics, passes=10, workers=2)
-
-    # Get the topic for each review and its score
-    def get_topic(bow):
-        topics = lda_model.get_document_topics(bow, minimum_probability=0.0)
-        topics.sort(key=lambda x: x[1], reverse=True)
-        return topics[0][0]
-
-    df['dominant_topic'] = [get_topic(bow) for bow in corpus]
+    df['dominant_topic'] = topic_model.dominant_topics(processed_docs)
     print("✅ Topic modeling features added.")
 
     # --- 3. User and Place-level Aggregates (Proxy for Timestamps) ---
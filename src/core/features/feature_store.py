@@ -0,0 +1,138 @@
+import hashlib
+import json
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from src.data.sqlite_store import SQLiteStore
+
+DEFAULT_FEATURE_STORE_PATH = "src/data/processed/feature_store.sqlite"
+
+# Bump when feature extraction code changes, so stored rows are recomputed
+FEATURE_VERSION = "1"
+
+
+def feature_version(featurizer) -> str:
+    """FEATURE_VERSION plus the TF-IDF vocabulary, since a refit changes every tfidf row."""
+    vocab = json.dumps(list(featurizer.vectorizer.get_feature_names_out()))
+    return f"{FEATURE_VERSION}-{hashlib.sha256(vocab.encode('utf-8')).hexdigest()[:8]}"
+
+
+def review_keys(df: pd.DataFrame) -> list:
+    """review_id when present, else a hash of author and text."""
+    if "review_id" in df.columns:
+        return df["review_id"].astype(str).tolist()
+    author = df["user_name"] if "user_name" in df.columns else df.get("author_name", pd.Series("", index=df.index))
+    return [
+        hashlib.sha1(f"{a}\x1f{t}".encode("utf-8")).hexdigest()
+        for a, t in zip(author.astype(str), df["text"].astype(str))
+    ]
+
+
+def content_hashes(df: pd.DataFrame) -> list:
+    """One hash per row over all input columns; a changed review gets a new hash."""
+    return pd.util.hash_pandas_object(df.astype(str), index=False).astype(str).tolist()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class FeatureStore(SQLiteStore):
+    """SQLite-backed feature rows keyed by (review_id, feature version).
+
+    Each row keeps the hash of the input it was computed from, so a run only
+    recomputes new or changed reviews. TF-IDF rows are stored sparse.
+    """
+
+    def __init__(self, path=DEFAULT_FEATURE_STORE_PATH):
+        super().__init__(path, [
+            "CREATE TABLE IF NOT EXISTS features ("
+            "review_id TEXT NOT NULL, version TEXT NOT NULL, content_hash TEXT NOT NULL, business_name TEXT, "
+            "features TEXT NOT NULL, tfidf TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (review_id, version))",
+            # the most recently activated version is the one served by default
+            "CREATE TABLE IF NOT EXISTS versions (version TEXT PRIMARY KEY, tfidf_columns TEXT NOT NULL, activated_at REAL NOT NULL)",
+        ])
+
+    @property
+    def current_version(self):
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM versions ORDER BY activated_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def activate_version(self, version, tfidf_columns):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO versions (version, tfidf_columns, activated_at) VALUES (?, ?, ?)",
+                (version, json.dumps(list(tfidf_columns)), time.time()),
+            )
+            self._conn.commit()
+
+    def tfidf_columns(self, version=None):
+        version = version or self.current_version
+        with self._lock:
+            row = self._conn.execute("SELECT tfidf_columns FROM versions WHERE version = ?", (version,)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def stale(self, keys, hashes, version):
+        """True for every review with no stored features for `version`, or whose input changed."""
+        with self._lock:
+            stored = dict(self._select_in(
+                "SELECT review_id, content_hash FROM features WHERE version = ? AND review_id IN ({placeholders})",
+                list(dict.fromkeys(keys)),
+                params=[version],
+            ))
+        return [stored.get(key) != h for key, h in zip(keys, hashes)]
+
+    def put(self, keys, hashes, features: pd.DataFrame, tfidf_matrix, version):
+        tfidf_matrix = sp.csr_matrix(tfidf_matrix)
+        business = features["business_name"] if "business_name" in features.columns else pd.Series(None, index=features.index)
+        now = time.time()
+        rows = []
+        for i, (key, h, record, name) in enumerate(zip(keys, hashes, features.to_dict("records"), business)):
+            start, end = tfidf_matrix.indptr[i], tfidf_matrix.indptr[i + 1]
+            tfidf = {"indices": tfidf_matrix.indices[start:end].tolist(), "data": tfidf_matrix.data[start:end].tolist()}
+            rows.append((key, version, h, None if pd.isna(name) else str(name),
+                         json.dumps(record, default=_json_default), json.dumps(tfidf), now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO features (review_id, version, content_hash, business_name, features, tfidf, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def get(self, business_name=None, version=None):
+        """(features, tfidf_matrix) for `version` (default: the latest), optionally one business.
+
+        `business_name` matches case-insensitively anywhere in the stored name.
+        """
+        version = version or self.current_version
+        query = "SELECT features, tfidf FROM features WHERE version = ?"
+        params = [version]
+        if business_name:
+            query += " AND instr(lower(business_name), lower(?)) > 0"
+            params.append(business_name)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+
+        features = pd.DataFrame([json.loads(f) for f, _ in rows])
+        n_columns = len(self.tfidf_columns(version))
+        tfidf = [json.loads(t) for _, t in rows]
+        indptr = np.cumsum([0] + [len(t["indices"]) for t in tfidf])
+        matrix = sp.csr_matrix(
+            (
+                np.array([v for t in tfidf for v in t["data"]], dtype=float),
+                np.array([j for t in tfidf for j in t["indices"]], dtype=np.int32),
+                indptr,
+            ),
+            shape=(len(rows), n_columns),
+        )
+        return features, matrix
+
+    def __len__(self):
+        version = self.current_version
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM features WHERE version = ?", (version,)).fetchone()[0]
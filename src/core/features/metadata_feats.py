@@ -18,7 +18,11 @@ def extract_metadata_features(df: pd.DataFrame):
     df["review_length"] = df["text_en"].apply(lambda x: len(str(x).split()))
     df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
 
-    # Category encoding for rating
+    return encode_categories(df)
+
+
+def encode_categories(df: pd.DataFrame):
+    # Codes depend on the categories present in df, so recompute them over the rows being served
     if "rating_category" in df.columns:
         df["rating_category_encoded"] = df["rating_category"].astype("category").cat.codes
         
@@ -0,0 +1,66 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from textblob import TextBlob
+
+SENTIMENT_COLUMNS = ["sentiment_polarity", "sentiment_subjectivity"]
+
+_MEMO_SIZE = 200_000
+_memo = OrderedDict()          # sha1 of the text -> (polarity, subjectivity), least recently used first
+_memo_lock = threading.Lock()
+
+
+def _text_key(text) -> bytes:
+    return hashlib.sha1(str(text).encode("utf-8")).digest()
+
+
+def _compute(texts):
+    # one TextBlob pass gives both scores
+    return [tuple(TextBlob(text).sentiment) for text in texts]
+
+
+def sentiment(text):
+    """(polarity, subjectivity) of one text, memoized."""
+    return tuple(sentiment_frame(pd.Series([text])).iloc[0].tolist())
+
+
+def sentiment_frame(texts, workers=1, chunksize=5_000) -> pd.DataFrame:
+    """Polarity and subjectivity for every text, as SENTIMENT_COLUMNS aligned to `texts`.
+
+    Each distinct text is scored once per process lifetime: repeats within the call
+    and texts scored by earlier calls come from a memo keyed by the text's hash.
+    With `workers` > 1, new texts are scored across a process pool.
+    """
+    # map(str), not astype(str): a missing text must become "nan", as str(x) did
+    texts = pd.Series(texts).map(str)
+    keys = [_text_key(text) for text in texts]
+
+    scores = {}
+    todo = {}
+    with _memo_lock:
+        for key, text in zip(keys, texts):
+            if key in scores or key in todo:
+                continue
+            if key in _memo:
+                _memo.move_to_end(key)
+                scores[key] = _memo[key]
+            else:
+                todo[key] = text
+
+    if todo:
+        todo_keys, todo_texts = list(todo), list(todo.values())
+        chunks = [todo_texts[start:start + chunksize] for start in range(0, len(todo_texts), chunksize)]
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                computed = [score for part in pool.map(_compute, chunks) for score in part]
+        else:
+            computed = _compute(todo_texts)
+        scores.update(zip(todo_keys, computed))
+        with _memo_lock:
+            _memo.update(zip(todo_keys, computed))
+            while len(_memo) > _MEMO_SIZE:
+                _memo.popitem(last=False)
+
+    return pd.DataFrame([scores[key] for key in keys], columns=SENTIMENT_COLUMNS, index=texts.index, dtype=float)
@@ -1,14 +1,19 @@
 import os
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from textblob import TextBlob
+from src.features.sentiment import sentiment_frame, SENTIMENT_COLUMNS
+from src.features.tfidf import TfidfFeaturizer, save_tfidf_matrix
 
 DATA_DIR = "src/data"
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def extract_text_features(df, text_col="text_en"):
+def extract_text_features(df, text_col="text_en", workers=1, featurizer=None):
+    """Engineered text features, plus the TF-IDF matrix of `text_col` as scipy CSR.
+
+    Returns (features, tfidf_matrix); matrix rows follow the rows of `df`. An unfitted
+    (or missing) `featurizer` is fitted on `df`, a fitted one only transforms.
+    """
     # Keep original columns
     output = df.copy()
 
@@ -20,23 +25,22 @@ def extract_text_features(df, text_col="text_en"):
     )
 
     # Sentiment
-    output["sentiment_polarity"] = df[text_col].apply(lambda x: TextBlob(str(x)).sentiment.polarity)
-    output["sentiment_subjectivity"] = df[text_col].apply(lambda x: TextBlob(str(x)).sentiment.subjectivity)
-
-    # TF-IDF (top 50 keywords)
-    tfidf = TfidfVectorizer(max_features=50, stop_words="english")
-    tfidf_matrix = tfidf.fit_transform(df[text_col].astype(str))
-    tfidf_df = pd.DataFrame(tfidf_matrix.toarray(), 
-                            columns=[f"tfidf_{t}" for t in tfidf.get_feature_names_out()],
-                            index=df.index)
+    output[SENTIMENT_COLUMNS] = sentiment_frame(df[text_col], workers=workers)
 
-    # Merge everything (original + engineered features)
-    output = pd.concat([output, tfidf_df], axis=1)
-    return output
+    # TF-IDF (top max_features keywords), kept sparse instead of one dense column per term
+    if featurizer is None:
+        featurizer = TfidfFeaturizer()
+    if not featurizer.fitted:
+        featurizer.fit(df[text_col])
+    tfidf_matrix = featurizer.transform(df[text_col])
+    return output, tfidf_matrix
 
 
 if __name__ == "__main__":
     df = pd.read_csv(os.path.join(DATA_DIR, "KaggleReviews_processed.csv"))
-    text_feats = extract_text_features(df, text_col="text_en")
+    featurizer = TfidfFeaturizer.load()
+    text_feats, tfidf_matrix = extract_text_features(df, text_col="text_en", featurizer=featurizer)
+    featurizer.save()
     text_feats.to_csv(os.path.join(DATA_DIR, "text_features.csv"), index=False)
-    print("[✅] Text features saved to data/text_features.csv")
+    save_tfidf_matrix(tfidf_matrix, os.path.join(DATA_DIR, "text_features.csv"))
+    print("[✅] Text features saved to data/text_features.csv (TF-IDF in data/text_features.tfidf.npz)")
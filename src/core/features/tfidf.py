@@ -0,0 +1,68 @@
+import os
+import joblib
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+DEFAULT_TFIDF_PATH = "src/data/models/tfidf.joblib"
+
+
+def tfidf_matrix_path(table_path: str) -> str:
+    """Where the TF-IDF matrix of a feature table lives: next to it, as <table>.tfidf.npz."""
+    return f"{os.path.splitext(table_path)[0]}.tfidf.npz"
+
+
+class TfidfFeaturizer:
+    """A TF-IDF vocabulary fitted once and reused, so feature columns match across runs.
+
+    `transform` returns a scipy CSR matrix, so `max_features` can grow without
+    materializing a dense column per term.
+    """
+
+    def __init__(self, max_features=50, stop_words="english", path=DEFAULT_TFIDF_PATH):
+        self.path = path
+        self.vectorizer = TfidfVectorizer(max_features=max_features, stop_words=stop_words)
+        self.fitted = False
+
+    @property
+    def feature_names(self):
+        return [f"tfidf_{t}" for t in self.vectorizer.get_feature_names_out()]
+
+    def fit(self, texts):
+        self.vectorizer.fit(list(map(str, texts)))
+        self.fitted = True
+        return self
+
+    def transform(self, texts) -> sp.csr_matrix:
+        if not self.fitted:
+            raise ValueError("TfidfFeaturizer is not fitted; call fit() or load a saved one")
+        return self.vectorizer.transform(list(map(str, texts))).tocsr()
+
+    def fit_transform(self, texts) -> sp.csr_matrix:
+        return self.fit(texts).transform(texts)
+
+    # ---------------- Persistence ----------------
+
+    def save(self, path=None):
+        path = path or self.path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_TFIDF_PATH, **kwargs):
+        """Loads a saved featurizer, or returns an unfitted one with `kwargs` if none exists."""
+        if not os.path.exists(path):
+            return cls(path=path, **kwargs)
+        featurizer = joblib.load(path)
+        featurizer.path = path
+        return featurizer
+
+
+def save_tfidf_matrix(matrix, table_path: str) -> str:
+    path = tfidf_matrix_path(table_path)
+    sp.save_npz(path, sp.csr_matrix(matrix))
+    return path
+
+
+def load_tfidf_matrix(table_path: str) -> sp.csr_matrix:
+    return sp.load_npz(tfidf_matrix_path(table_path)).tocsr()
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from gensim.models import LdaMulticore
+from gensim.corpora import Dictionary
+from gensim.parsing.preprocessing import STOPWORDS
+
+DEFAULT_TOPIC_MODEL_DIR = "src/data/models/topics"
+
+
+def tokenize(text) -> list:
+    return [word for word in str(text).split() if word not in STOPWORDS]
+
+
+class TopicModel:
+    """LDA topics that persist across runs, so `dominant_topic` ids stay stable.
+
+    The first `update` trains the dictionary and model from scratch. Later calls
+    feed only unseen documents through gensim's online update (new words are out
+    of vocabulary, as the dictionary is fixed once trained). `save`/`load` keep the
+    dictionary, model and the hashes of documents already learned from.
+    """
+
+    def __init__(self, num_topics=3, passes=10, workers=None, path=DEFAULT_TOPIC_MODEL_DIR):
+        self.num_topics = num_topics
+        self.passes = passes
+        self.workers = workers or os.cpu_count() or 1
+        self.path = path
+        self.dictionary = None
+        self.lda = None
+        self.seen = set()
+
+    @staticmethod
+    def _doc_key(tokens) -> str:
+        return hashlib.sha1(" ".join(tokens).encode("utf-8")).hexdigest()
+
+    def update(self, docs):
+        """Learns from tokenized documents it has not seen before. Returns how many were new."""
+        new_docs = {}
+        for tokens in docs:
+            key = self._doc_key(tokens)
+            if key not in self.seen:
+                new_docs.setdefault(key, tokens)
+        if not new_docs:
+            return 0
+
+        if self.lda is None:
+            self.dictionary = Dictionary(new_docs.values())
+            corpus = [self.dictionary.doc2bow(tokens) for tokens in new_docs.values()]
+            self.lda = LdaMulticore(corpus=corpus, id2word=self.dictionary, num_topics=self.num_topics,
+                                    passes=self.passes, workers=max(self.workers - 1, 1))
+            print(f"✅ Topic model trained on {len(corpus)} documents")
+        else:
+            corpus = [self.dictionary.doc2bow(tokens) for tokens in new_docs.values()]
+            self.lda.update(corpus)
+            print(f"✅ Topic model updated with {len(corpus)} new documents")
+        self.seen.update(new_docs)
+        return len(new_docs)
+
+    def dominant_topics(self, docs, chunksize=2_000):
+        """Most probable topic per document, inferred in batches across `workers` processes."""
+        corpus = [self.dictionary.doc2bow(tokens) for tokens in docs]
+        chunks = [corpus[start:start + chunksize] for start in range(0, len(corpus), chunksize)]
+        if self.workers > 1 and len(chunks) > 1:
+            # the model is sent once per worker process, not with every chunk
+            workers = min(self.workers, len(chunks))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.lda,)) as pool:
+                parts = list(pool.map(_dominant_topics_worker, chunks))
+        else:
+            parts = [_dominant_topics(self.lda, chunk) for chunk in chunks]
+        return np.concatenate(parts) if parts else np.array([], dtype=int)
+
+    # ---------------- Persistence ----------------
+
+    def save(self, path=None):
+        path = path or self.path
+        os.makedirs(path, exist_ok=True)
+        self.dictionary.save(os.path.join(path, "dictionary.gensim"))
+        self.lda.save(os.path.join(path, "lda.gensim"))
+        with open(os.path.join(path, "seen_docs.pkl"), "wb") as f:
+            pickle.dump(self.seen, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path=DEFAULT_TOPIC_MODEL_DIR, **kwargs):
+        """Loads a saved model, or returns an untrained one with `kwargs` if none exists."""
+        model = cls(path=path, **kwargs)
+        if not os.path.exists(os.path.join(path, "lda.gensim")):
+            return model
+        model.dictionary = Dictionary.load(os.path.join(path, "dictionary.gensim"))
+        model.lda = LdaMulticore.load(os.path.join(path, "lda.gensim"))
+        model.num_topics = model.lda.num_topics
+        seen_path = os.path.join(path, "seen_docs.pkl")
+        if os.path.exists(seen_path):
+            with open(seen_path, "rb") as f:
+                model.seen = pickle.load(f)
+        return model
+
+
+_worker_lda = None          # the LDA model of a dominant_topics worker process
+_worker_random_state = None
+
+
+def _init_worker(lda):
+    global _worker_lda, _worker_random_state
+    _worker_lda = lda
+    _worker_random_state = lda.random_state.get_state()
+
+
+def _dominant_topics_worker(corpus):
+    # inference draws its starting point from random_state; resetting it per chunk keeps
+    # results independent of which worker a chunk lands on, as with a fresh model copy
+    _worker_lda.random_state.set_state(_worker_random_state)
+    return _dominant_topics(_worker_lda, corpus)
+
+
+def _dominant_topics(lda, corpus):
+    # gamma rows are unnormalized topic weights, so their argmax is the dominant topic
+    gamma, _ = lda.inference(corpus)
+    return gamma.argmax(axis=1)
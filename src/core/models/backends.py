@@ -0,0 +1,98 @@
+import os
+import time
+
+ZERO_SHOT_BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_ONNX_DIR = "src/data/models/onnx"
+
+
+def configured_backend():
+    return os.getenv("ZERO_SHOT_BACKEND", "torch")
+
+
+def load_zero_shot_backend(model_name, backend=None):
+    """Returns a zero-shot-classification pipeline running on the requested CPU backend.
+
+    - torch: the fp32 PyTorch model, as loaded by `pipeline(...)`
+    - int8:  the same model with its Linear layers dynamically quantized to int8
+    - onnx:  an ONNX Runtime graph exported with optimum (needs `optimum[onnxruntime]`),
+             exported on first use and loaded from DEFAULT_ONNX_DIR afterwards
+    """
+    backend = backend or configured_backend()
+    pipe = _build_pipeline(model_name, backend)
+    pipe.backend = backend  # part of the verdict cache's model id
+    return pipe
+
+
+def _build_pipeline(model_name, backend):
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "torch":
+        return pipeline("zero-shot-classification", model=model_name)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if backend == "int8":
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise ImportError("The 'onnx' backend needs optimum[onnxruntime]: pip install 'optimum[onnxruntime]'") from e
+        model = _load_onnx_model(ORTModelForSequenceClassification, model_name)
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+
+    raise ValueError(f"Unknown zero-shot backend '{backend}', expected one of {ZERO_SHOT_BACKENDS}")
+
+
+def onnx_model_dir(model_name):
+    """Where the ONNX export of `model_name` is kept, e.g. src/data/models/onnx/facebook--bart-large-mnli."""
+    return os.path.join(DEFAULT_ONNX_DIR, model_name.replace("/", "--"))
+
+
+def _load_onnx_model(model_cls, model_name):
+    # exporting takes minutes, so it happens once; later loads read the saved graph
+    path = onnx_model_dir(model_name)
+    if os.path.exists(os.path.join(path, "model.onnx")):
+        return model_cls.from_pretrained(path)
+    model = model_cls.from_pretrained(model_name, export=True)
+    model.save_pretrained(path)
+    return model
+
+
+def check_parity(texts, candidate, reference, tolerance=0.01, batch_size=16):
+    """Compares the ML violation verdicts of two zero-shot models on a sample of texts.
+
+    `tolerance` is the largest share of rows allowed to flip on any policy.
+    """
+    from src.policy.policy_enforcer import PolicyEnforcer
+
+    texts = [str(t) for t in texts]
+    report = {"rows": len(texts), "policies": {}}
+    timings = {}
+    verdicts = {}
+    for name, model in (("reference", reference), ("candidate", candidate)):
+        enforcer = PolicyEnforcer(relevance_model=model, rant_model=model, use_zero_shot=True, batch_size=batch_size)
+        start = time.perf_counter()
+        verdicts[name] = enforcer.check_zero_shot_multi(texts)
+        timings[name] = time.perf_counter() - start
+
+    worst = 0.0
+    for policy, ref_flags in verdicts["reference"].items():
+        cand_flags = verdicts["candidate"][policy]
+        flipped = sum(r != c for r, c in zip(ref_flags, cand_flags))
+        rate = flipped / len(texts) if texts else 0.0
+        worst = max(worst, rate)
+        report["policies"][policy] = {"flipped": flipped, "flip_rate": rate}
+
+    report["max_flip_rate"] = worst
+    report["tolerance"] = tolerance
+    report["within_tolerance"] = worst <= tolerance
+    report["seconds"] = timings
+    report["speedup"] = timings["reference"] / timings["candidate"] if timings["candidate"] else None
+    return report
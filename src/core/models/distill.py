@@ -0,0 +1,72 @@
+import os
+import time
+import joblib
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from src.models.classical import train_lr
+
+DISTILLED_DIR = "src/data/models/distilled"
+
+
+def gate_report(model, texts, teacher_labels, threshold=0.9):
+    """How a distilled model would behave behind a confidence gate on labelled texts."""
+    teacher_labels = np.asarray(teacher_labels, dtype=int)
+    proba = model.predict_proba(list(texts))[:, list(model.classes_).index(1)]
+    preds = (proba >= 0.5).astype(int)
+    confident = np.maximum(proba, 1 - proba) >= threshold
+    agree = preds == teacher_labels
+
+    n = len(teacher_labels)
+    return {
+        "rows": n,
+        "agreement": float(agree.mean()) if n else 0.0,
+        "confident_agreement": float(agree[confident].mean()) if confident.any() else 0.0,
+        "escalation_rate": float(1 - confident.mean()) if n else 0.0,
+        # gated verdicts: confident rows from the student, the rest from the teacher
+        "gated_agreement": float(np.where(confident, agree, True).mean()) if n else 0.0,
+    }
+
+
+def distill_policies(texts, teacher_flags, threshold=0.9, test_size=0.2, random_state=42):
+    """Trains one TF-IDF + LogisticRegression student per policy on zero-shot verdicts.
+
+    `teacher_flags` maps a policy name to one boolean per text (1 = violation), e.g.
+    the output of `PolicyEnforcer.check_zero_shot_multi`. Returns (models, reports).
+    """
+    texts = [str(t) for t in texts]
+    models, reports = {}, {}
+    for policy, flags in teacher_flags.items():
+        labels = np.asarray(flags, dtype=int)
+        if len(set(labels)) < 2:
+            print(f"⚠️ Skipping '{policy}': teacher labels contain a single class")
+            continue
+
+        stratify = labels if min(np.bincount(labels)) >= 2 else None
+        X_train, X_test, y_train, y_test = train_test_split(
+            texts, labels, test_size=test_size, random_state=random_state, stratify=stratify
+        )
+        model = train_lr(X_train, y_train)
+        model.distilled_at = time.strftime("%Y%m%dT%H%M%S")
+        models[policy] = model
+        reports[policy] = gate_report(model, X_test, y_test, threshold)
+        r = reports[policy]
+        print(f"✅ Distilled '{policy}': agreement {r['agreement']:.1%}, "
+              f"confident agreement {r['confident_agreement']:.1%}, escalation {r['escalation_rate']:.1%}")
+    return models, reports
+
+
+def save_distilled(models, directory=DISTILLED_DIR):
+    os.makedirs(directory, exist_ok=True)
+    for policy, model in models.items():
+        joblib.dump(model, os.path.join(directory, f"{policy}.joblib"))
+
+
+def load_distilled(directory=DISTILLED_DIR):
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        name[: -len(".joblib")]: joblib.load(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if name.endswith(".joblib")
+    }
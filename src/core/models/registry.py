@@ -0,0 +1,99 @@
+import threading
+import time
+
+ZERO_SHOT_MODEL = "facebook/bart-large-mnli"
+TRANSLATION_MODEL = "facebook/m2m100_418M"
+
+_MISSING = object()
+
+
+def load_zero_shot(model_name=ZERO_SHOT_MODEL, backend=None):
+    # backend defaults to the ZERO_SHOT_BACKEND env var (torch | int8 | onnx)
+    from src.models.backends import load_zero_shot_backend
+    return load_zero_shot_backend(model_name, backend)
+
+
+def load_translator(model_name=TRANSLATION_MODEL):
+    from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+    tokenizer = M2M100Tokenizer.from_pretrained(model_name)
+    model = M2M100ForConditionalGeneration.from_pretrained(model_name)
+    model.eval()
+    return tokenizer, model
+
+
+def load_distilled_policies():
+    # empty until scripts/distill_policies.py has been run
+    from src.models.distill import load_distilled
+    return load_distilled()
+
+
+class ModelRegistry:
+    """Process-wide cache of heavy models, loaded once and shared by every caller."""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._loaded_at = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def __contains__(self, name):
+        return name in self._loaders
+
+    def get(self, name):
+        # a single read: a concurrent reload swaps the entry but never removes it
+        model = self._models.get(name, _MISSING)
+        if model is not _MISSING:
+            return model
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+        with self._locks[name]:
+            # another thread may have finished loading while we waited
+            model = self._models.get(name, _MISSING)
+            if model is _MISSING:
+                model = self._load(name)
+        return model
+
+    def _load(self, name):
+        start = time.perf_counter()
+        model = self._loaders[name]()
+        self._models[name] = model
+        self._loaded_at[name] = time.time()
+        print(f"✅ Model '{name}' loaded in {time.perf_counter() - start:.1f}s")
+        return model
+
+    def preload(self, names=None):
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def reload(self, name=None):
+        names = [name] if name else list(self._loaders)
+        for n in names:
+            if n not in self._loaders:
+                raise KeyError(f"No model registered under '{n}'")
+            # the old model keeps serving get() until the new one is swapped in
+            with self._locks[n]:
+                self._load(n)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def is_ready(self, names=None):
+        return all(self.is_loaded(n) for n in (names or self._loaders))
+
+    def status(self):
+        return {
+            name: {"loaded": name in self._models, "loaded_at": self._loaded_at.get(name)}
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
+registry.register("zero_shot", load_zero_shot)
+registry.register("translator", load_translator)
+registry.register("distilled", load_distilled_policies)
@@ -0,0 +1,66 @@
+import re
+import pandas as pd
+
+
+def _is_word_char(char):
+    # the same characters as the regex class \w
+    return char.isalnum() or char == "_"
+
+
+def contains_word(text, phrase):
+    """True when `phrase` occurs in `text` bounded by non-word characters, so "damn" is not in "damnation"."""
+    start = text.find(phrase)
+    while start != -1:
+        end = start + len(phrase)
+        if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+            return True
+        start = text.find(phrase, start + 1)
+    return False
+
+
+class KeywordMatcher:
+    """Reports which rule groups a text hits.
+
+    `keywords` maps a group name to whole-word phrases; `patterns` maps a group
+    name to raw regexes (e.g. URL shapes). Texts are lower-cased once, then each
+    keyword is a plain substring test, with word boundaries only checked around the
+    occurrences found; a group stops at its first hit. Patterns are matched against
+    the lower-cased text.
+    """
+
+    def __init__(self, keywords=None, patterns=None):
+        self.keywords = {group: set(kws) for group, kws in (keywords or {}).items()}
+        self.patterns = {group: list(pats) for group, pats in (patterns or {}).items()}
+        self.groups = list(dict.fromkeys([*self.keywords, *self.patterns]))
+
+        self._phrases = {
+            group: sorted({kw.lower() for kw in self.keywords.get(group, ())}, key=len, reverse=True)
+            for group in self.groups
+        }
+        self.regexes = {
+            group: re.compile("|".join(f"(?:{pat})" for pat in pats))
+            for group, pats in self.patterns.items() if pats
+        }
+        self._rules = [(self._phrases[group], self.regexes.get(group)) for group in self.groups]
+
+    def _hits(self, text):
+        """One bool per group for a lower-cased text."""
+        hits = []
+        for phrases, regex in self._rules:
+            for phrase in phrases:
+                if phrase in text and contains_word(text, phrase):
+                    hits.append(True)
+                    break
+            else:
+                hits.append(regex is not None and regex.search(text) is not None)
+        return hits
+
+    def match(self, text):
+        """Returns the set of groups hit by a single text."""
+        return {group for group, hit in zip(self.groups, self._hits(str(text).lower())) if hit}
+
+    def match_series(self, texts):
+        """Returns a boolean DataFrame (one column per group) aligned with `texts`, in one pass over the rows."""
+        lowered = texts.fillna("").astype(str).str.lower()
+        rows = [self._hits(text) for text in lowered.tolist()]
+        return pd.DataFrame(rows, index=texts.index, columns=self.groups, dtype=bool)
@@ -0,0 +1,292 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from contextlib import closing
+import numpy as np
+
+DEFAULT_INDEX_PATH = "src/data/processed/near_duplicates.sqlite"
+# scripts/enforce_policies.py keeps its own windowed index, apart from the API's
+STREAM_INDEX_PATH = "src/data/processed/near_duplicates_stream.sqlite"
+# max_documents for streamed runs: about 300 MB of index at the cap
+STREAM_WINDOW = 100_000
+
+_PRIME = (1 << 31) - 1
+_TOKEN = re.compile(r"\w+")
+_FNV_PRIME = 0x100000001B3
+
+
+class NearDuplicateIndex:
+    """MinHash signatures over word shingles, bucketed with LSH banding.
+
+    Reviews are only compared with the candidates that share at least one band,
+    and each bucket holds one representative per cluster, so adding n reviews
+    costs roughly O(n) even when many of them repeat the same text. A candidate
+    is a near-duplicate when its estimated Jaccard similarity is at least
+    `threshold`. Clusters are tracked with union-find and survive `save`/`load`,
+    so later batches are checked incrementally. The index is stored in SQLite, and a
+    save only writes the documents added or merged since the previous one.
+
+    With `max_documents`, the index forgets its oldest documents whenever it holds
+    more than that, keeping the newest half; clusters seen earlier keep their ids
+    and sizes, so a late copy of a forgotten review is only missed if no copy is
+    still held. Each held review costs roughly 3 KB.
+    """
+
+    def __init__(self, threshold=0.7, num_perm=128, bands=32, shingle_size=3, min_shingles=5, seed=42, max_documents=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.seed = seed
+        self.max_documents = max_documents
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+        self.positions = {}                  # document key -> position, for the documents held
+        self.signatures = {}                 # position -> signature (absent for texts below min_shingles)
+        self.parent = {}                     # union-find over positions
+        self.size = {}
+        # band key -> a position, or a list of them once several clusters share the bucket
+        self.buckets = [{} for _ in range(bands)]
+        self.next_position = 0
+        self._lock = threading.Lock()
+
+        # what the next save has to write
+        self._new = {}                       # position -> key of documents added since the last save/load
+        self._merged = set()                 # positions whose parent or cluster size changed
+        self._rewrite = False                # eviction renumbered the forest: write everything
+        self._saved_path = None              # the file this index was last saved to or loaded from
+
+    @property
+    def changed(self):
+        """True when documents were added or merged since the last save/load."""
+        return bool(self._new or self._merged or self._rewrite)
+
+    # ---------------- MinHash ----------------
+
+    def shingles(self, text):
+        """Word shingles of `text`; empty when it has fewer than `shingle_size` words."""
+        tokens = _TOKEN.findall(str(text).lower())
+        k = self.shingle_size
+        return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+    def signature(self, text):
+        """MinHash signature, or None for a text with fewer than `min_shingles` distinct shingles.
+
+        Short generic reviews ("The food was great!") are written independently by many
+        authors, so they never join a cluster; exact repeats by one author are still
+        caught by the (user_name, text) check.
+        """
+        shingles = self.shingles(text)
+        if len(shingles) < max(self.min_shingles, 1):
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles), dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        # one 64-bit int per band: far smaller than a bytes key, and stable across processes
+        rows = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        keys = rows[:, 0]
+        for i in range(1, self.rows):
+            keys = keys * np.uint64(_FNV_PRIME) ^ rows[:, i]
+        return keys.tolist()
+
+    # ---------------- Union-Find ----------------
+
+    def _find(self, pos):
+        while self.parent[pos] != pos:
+            self.parent[pos] = self.parent[self.parent[pos]]
+            pos = self.parent[pos]
+        return pos
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return
+        # the older document stays the root so cluster ids remain stable
+        root, child = min(ra, rb), max(ra, rb)
+        self.parent[child] = root
+        self.size[root] += self.size[child]
+        self._merged.update((child, root))
+
+    # ---------------- Index ----------------
+
+    @staticmethod
+    def _members(bucket):
+        if bucket is None:
+            return ()
+        return (bucket,) if isinstance(bucket, int) else bucket
+
+    def _bucket_add(self, band, band_key, pos, root):
+        """Adds `pos` to a bucket unless its cluster (`root`) is already represented there.
+
+        Keeping one representative per cluster stops repeated texts from growing the
+        candidate lists that every later document is compared against.
+        """
+        table = self.buckets[band]
+        bucket = table.get(band_key)
+        if bucket is None:
+            table[band_key] = pos
+        # the newest document is only its own root while it is unclustered
+        elif root == pos or all(self._find(other) != root for other in self._members(bucket)):
+            if isinstance(bucket, int):
+                table[band_key] = [bucket, pos]
+            else:
+                bucket.append(pos)
+
+    def _add_one(self, key, text):
+        if key in self.positions:
+            return self.positions[key]
+        pos = self.next_position
+        self.next_position += 1
+        self._new[pos] = key
+        self.positions[key] = pos
+        self.parent[pos] = pos
+        self.size[pos] = 1
+        signature = self.signature(text)
+        if signature is None:
+            return pos
+        self.signatures[pos] = signature
+
+        band_keys = self._band_keys(signature)
+        candidates = {
+            other
+            for band, band_key in enumerate(band_keys)
+            for other in self._members(self.buckets[band].get(band_key))
+        }
+        for other in candidates:
+            if self._find(other) == self._find(pos):
+                continue
+            if np.mean(self.signatures[other] == signature) >= self.threshold:
+                self._union(pos, other)
+        root = self._find(pos)
+        for band, band_key in enumerate(band_keys):
+            self._bucket_add(band, band_key, pos, root)
+        return pos
+
+    def _evict(self):
+        """Forgets the oldest documents, keeping the newest max_documents // 2."""
+        cutoff = self.next_position - self.max_documents // 2
+        self.positions = {key: pos for key, pos in self.positions.items() if pos >= cutoff}
+        roots = {pos: self._find(pos) for pos in self.positions.values()}
+        # forgotten roots stay as cluster ids (with their full size) while members remain
+        self.size = {root: self.size[root] for root in set(roots.values())}
+        self.parent = {root: root for root in self.size}
+        self.parent.update(roots)
+        self.signatures = {pos: sig for pos, sig in self.signatures.items() if pos >= cutoff}
+        self._rebuild_buckets()
+        self._rewrite = True
+
+    def _rebuild_buckets(self):
+        self.buckets = [{} for _ in range(self.bands)]
+        for pos in sorted(self.signatures):
+            root = self._find(pos)
+            for band, band_key in enumerate(self._band_keys(self.signatures[pos])):
+                self._bucket_add(band, band_key, pos, root)
+
+    def check(self, keys, texts):
+        """Adds the documents and returns (is_near_duplicate, cluster_id) per document.
+
+        Documents that belong to no cluster get cluster id -1.
+        """
+        with self._lock:
+            positions = [self._add_one(key, text) for key, text in zip(keys, texts)]
+            flags, clusters = [], []
+            for pos in positions:
+                root = self._find(pos)
+                duplicate = self.size[root] > 1
+                flags.append(duplicate)
+                clusters.append(root if duplicate else -1)
+            if self.max_documents is not None and len(self.positions) > self.max_documents:
+                self._evict()
+        return flags, clusters
+
+    def __len__(self):
+        return len(self.positions)
+
+    # ---------------- Persistence ----------------
+
+    _PARAMS = ("threshold", "num_perm", "bands", "shingle_size", "min_shingles", "seed", "next_position")
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        """Writes the index to the SQLite file at `path`.
+
+        Saving again to the file last saved to or loaded from only writes what changed
+        since then, so the cost of a save follows the batch, not the whole index.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock, closing(sqlite3.connect(path)) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            # one row per union-find node; key is NULL for a forgotten root, signature for short texts
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents (position INTEGER PRIMARY KEY, key TEXT, "
+                "signature BLOB, parent INTEGER NOT NULL, size INTEGER)"
+            )
+            if self._rewrite or self._saved_path != os.path.abspath(path):
+                conn.execute("DELETE FROM documents")
+                keys = {pos: key for key, pos in self.positions.items()}
+                new, merged = {pos: keys.get(pos) for pos in self.parent}, set()
+            else:
+                new, merged = self._new, self._merged.difference(self._new)
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (position, key, signature, parent, size) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (pos, key, self._signature_blob(pos), self.parent[pos], self.size.get(pos))
+                    for pos, key in new.items()
+                ],
+            )
+            conn.executemany(
+                "UPDATE documents SET parent = ?, size = ? WHERE position = ?",
+                [(self.parent[pos], self.size.get(pos), pos) for pos in merged if pos in self.parent],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                [(name, json.dumps(getattr(self, name))) for name in self._PARAMS],
+            )
+            conn.commit()
+
+            self._new, self._merged, self._rewrite = {}, set(), False
+            self._saved_path = os.path.abspath(path)
+
+    def _signature_blob(self, pos):
+        signature = self.signatures.get(pos)
+        return None if signature is None else signature.tobytes()
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH, max_documents=None, **kwargs):
+        """Loads a saved index, or builds an empty one with `kwargs` if none exists.
+
+        `max_documents` is not stored with the index; it applies to this process only.
+        """
+        if not os.path.exists(path):
+            return cls(max_documents=max_documents, **kwargs)
+        with closing(sqlite3.connect(path)) as conn:
+            params = {name: json.loads(value) for name, value in conn.execute("SELECT name, value FROM meta")}
+            rows = conn.execute("SELECT position, key, signature, parent, size FROM documents ORDER BY position").fetchall()
+
+        next_position = params.pop("next_position")
+        index = cls(max_documents=max_documents, **params)
+        index.next_position = next_position
+        for pos, key, signature, parent, size in rows:
+            if key is not None:
+                index.positions[key] = pos
+            index.parent[pos] = parent
+            if size is not None:
+                index.size[pos] = size
+            if signature is not None:
+                index.signatures[pos] = np.frombuffer(signature, dtype=np.uint32)
+        index._rebuild_buckets()
+        index._saved_path = os.path.abspath(path)
+        return index
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import yaml
+
+from src.policy.keyword_matcher import KeywordMatcher
+
+DEFAULT_POLICY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "policies.yaml")
+
+DEFAULT_THRESHOLDS = {
+    "min_length": 5,
+    "max_word_repeats": 5,
+    "rating_mismatch": {"high_rating": 4, "low_rating": 2, "polarity": 0.2},
+}
+
+
+class ExecutionPlan:
+    """A policy config compiled for execution.
+
+    Keyword and regex rules share one KeywordMatcher, which checks every rule group in a
+    single pass over the rows, and zero-shot policies are grouped by backbone so each
+    backbone is called once per batch.
+    """
+
+    def __init__(self, config, source=None):
+        if not isinstance(config, dict):
+            raise ValueError("Policy config must be a mapping")
+        self.source = source
+        self.config = config
+
+        thresholds = config.get("thresholds") or {}
+        mismatch = {**DEFAULT_THRESHOLDS["rating_mismatch"], **(thresholds.get("rating_mismatch") or {})}
+        self.thresholds = {**DEFAULT_THRESHOLDS, **thresholds, "rating_mismatch": mismatch}
+
+        self.rules = {}
+        for name, rule in (config.get("rules") or {}).items():
+            rule = rule or {}
+            patterns = list(rule.get("patterns") or [])
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex for rule '{name}': {pattern!r} ({e})") from e
+            self.rules[name] = {"keywords": set(rule.get("keywords") or []), "patterns": patterns}
+
+        self.models = {}
+        self.backbones = {}
+        for name, policy in (config.get("models") or {}).items():
+            policy = policy or {}
+            hypotheses = list(policy.get("hypotheses") or [])
+            positive = policy.get("positive")
+            backbone = policy.get("backbone")
+            if len(hypotheses) < 2 or positive not in hypotheses or not backbone:
+                raise ValueError(
+                    f"Model policy '{name}' needs a backbone, at least two hypotheses and a positive label among them"
+                )
+            self.models[name] = (hypotheses, positive)
+            self.backbones.setdefault(backbone, []).append(name)
+
+        self.matcher = KeywordMatcher(
+            keywords={name: rule["keywords"] for name, rule in self.rules.items() if rule["keywords"]},
+            patterns={name: rule["patterns"] for name, rule in self.rules.items() if rule["patterns"]},
+        )
+
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+        self.version = f"{config.get('version', 0)}-{digest}"
+
+    @property
+    def rule_policies(self):
+        """Rules that produce their own violation column (not the rule half of a model policy)."""
+        return [name for name in self.rules if name not in self.models]
+
+    def backbone_of(self, policy):
+        return next(backbone for backbone, policies in self.backbones.items() if policy in policies)
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def load_plan(path=DEFAULT_POLICY_PATH):
+    """Compiles the YAML policy file, recompiling only when the file changes on disk.
+
+    Once a plan has loaded, a missing or invalid edit is reported and the last good
+    plan is kept until the file changes again.
+    """
+    path = os.path.abspath(path)
+    with _plans_lock:
+        cached = _plans.get(path)
+        mtime = None
+        try:
+            mtime = os.path.getmtime(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            with open(path, encoding="utf-8") as f:
+                plan = ExecutionPlan(yaml.safe_load(f), source=path)
+        except Exception as e:
+            if not cached:
+                raise
+            print(f"⚠️ Keeping policies version {cached[1].version}, could not reload {path}: {e}")
+            if mtime is not None:
+                # don't re-parse the same broken edit on every call
+                _plans[path] = (mtime, cached[1])
+            return cached[1]
+        if cached:
+            print(f"🔁 Policies reloaded from {path} (version {plan.version})")
+        _plans[path] = (mtime, plan)
+        return plan
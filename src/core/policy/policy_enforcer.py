@@ -1,88 +1,704 @@
-import re, json
+import re, json, hashlib, os, copy, functools
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-from textblob import TextBlob
-from transformers import pipeline
+from src.features.sentiment import sentiment, sentiment_frame
+from src.models.registry import registry, load_zero_shot, ZERO_SHOT_MODEL
+from src.policy.policy_config import ExecutionPlan, load_plan, DEFAULT_POLICY_PATH
+from src.policy.near_duplicates import NearDuplicateIndex, STREAM_WINDOW
+
+# Verdicts from the built-in text checks, written after the configured keyword rules
+TEXT_CHECK_COLUMNS = [
+    "violation_repetition",
+    "repetition_top_token",
+    "repetition_ratio",
+    "violation_low_quality",
+    "violation_rating_mismatch",
+]
+
+# the zero-shot pipeline's default hypothesis; every review is paired with it once per label
+HYPOTHESIS_TEMPLATE = "This example is {}."
 
 
 class PolicyEnforcer:
-    def __init__(self, min_length=5, relevance_model=None, rant_model=None, use_zero_shot=False):
-        self.min_length = min_length
-        self.relevance_model = relevance_model or pipeline("zero-shot-classification", model="facebook/bart-large-mnli")  # ML model for relevance
-        self.rant_model = rant_model or pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-        self.use_zero_shot = use_zero_shot            # ML model for speculative rant
-
-        # Rule-based keyword sets
-        self.bad_words = {"shit", "fuck", "damn", "bitch", "idiot", "stupid"}
-        self.ad_keywords = {"visit", "promo", "discount", "buy now", "sale"}
-        self.rant_keywords = {"never been", "didn’t visit", "not visited", "not gone", "haven’t gone"}
+    def __init__(self, min_length=None, relevance_model=None, rant_model=None, use_zero_shot=False, batch_size=16, chunk_size=None, multi_hypothesis=True, cache=None, cascade=False, distilled_models=None, distill_threshold=0.9, max_tokens=None, length_bucketing=True, near_duplicates=True, duplicate_index=None, duplicate_threshold=0.7, workers=1, parallel_chunk_rows=20_000, policies=None):
+        self.sentiment_col = "sentiment_polarity"     # precomputed polarity of text_en, reused when present
+        self.batch_size = batch_size                  # batch size handed to the ML models
+        self.chunk_size = chunk_size                  # rows per model call, None = whole column
+        self.multi_hypothesis = multi_hypothesis      # score every policy label in one zero-shot pass
+        self.max_tokens = max_tokens                  # longer reviews are windowed and their scores averaged; None = what the model fits
+        self.length_bucketing = length_bucketing      # feed the model length-sorted batches to cut padding
+
+        # Both ML policies share the process-wide NLI backbone unless the caller supplies its own models
+        shared_model = None
+        if relevance_model is None or rant_model is None:
+            shared_model = registry.get("zero_shot")
+        self.relevance_model = relevance_model or shared_model  # ML model for relevance
+        self.rant_model = rant_model or shared_model            # ML model for speculative rant
+        self.use_zero_shot = use_zero_shot
+        self.cache = cache                            # optional VerdictCache shared across runs
+        self.cascade = cascade                        # skip costlier stages for rows already flagged
+        self.near_duplicates = near_duplicates        # MinHash-LSH near-duplicates on top of exact repeats
+        self.duplicate_index = duplicate_index        # persisted NearDuplicateIndex; None = fresh per enforce()
+        self.duplicate_threshold = duplicate_threshold
+        self.workers = workers                        # processes for the rule checks; 1 = in-process
+        self.parallel_chunk_rows = parallel_chunk_rows  # rows per worker task
+        self._exact_seen = None                       # (user_name, text) digests seen by enforce_iter
+        self.distilled_models = distilled_models or {}  # policy -> classifier distilled from zero-shot labels
+        self.distill_threshold = distill_threshold    # min class probability for a distilled verdict to stand
+        self.stage_counts = {}                        # rows that reached each stage in the last enforce()
+        self.last_ml_rows = None
+
+        # Policies come from YAML (path), a config dict or a compiled ExecutionPlan
+        self._policy_source = DEFAULT_POLICY_PATH if policies is None else policies
+        self._min_length_override = min_length
+        self.plan = None
+        self.refresh_policies()
+
+    def refresh_policies(self):
+        """Applies the current policy config; a changed YAML file is recompiled. Returns True on change."""
+        source = self._policy_source
+        if isinstance(source, ExecutionPlan):
+            plan = source
+        elif isinstance(source, dict):
+            plan = self.plan or ExecutionPlan(source)
+        else:
+            plan = load_plan(source)
+        if plan is self.plan:
+            return False
+
+        self.plan = plan
+        thresholds = plan.thresholds
+        self.min_length = self._min_length_override if self._min_length_override is not None else thresholds["min_length"]
+        self.max_word_repeats = thresholds["max_word_repeats"]  # a word repeated more often than this is spam
+        self.rating_thresholds = thresholds["rating_mismatch"]
+
+        # All keyword and regex rules, checked together in one pass over the rows
+        self.matcher = plan.matcher
+        self.bad_words = plan.rules.get("profanity", {}).get("keywords", set())
+        self.ad_keywords = plan.rules.get("advertisement", {}).get("keywords", set())
+        self.rant_keywords = plan.rules.get("rant_without_visit", {}).get("keywords", set())
+        return True
+
+    @property
+    def zero_shot_policies(self):
+        """Model policy -> (candidate labels, label that counts as a violation)."""
+        return self.plan.models
+
+    @property
+    def rule_verdict_columns(self):
+        return [f"violation_{name}" for name in self.plan.rule_policies] + TEXT_CHECK_COLUMNS
+
+    @property
+    def row_verdict_columns(self):
+        """Verdicts that depend only on the review itself and can be cached per review."""
+        return self.rule_verdict_columns + [f"violation_{name}" for name in self.zero_shot_policies]
+
     # ---------------- Rule-Based Checks ----------------
 
     def check_profanity(self, text):
-        return any(bad in text.lower() for bad in self.bad_words)
+        return "profanity" in self.matcher.match(text)
 
     def check_advertisement(self, text):
-        if re.search(r"(http[s]?://|www\.|\.\w{2,})", text.lower()):
-            return True
-        return any(kw in text.lower() for kw in self.ad_keywords)
+        return "advertisement" in self.matcher.match(text)
 
-    def check_repetition(self, text):
+    def check_rant_without_visit_rule(self, text):
+        return "rant_without_visit" in self.matcher.match(text)
+
+    def check_rules_batch(self, texts):
+        """Every keyword/URL rule hit for a column of texts, in one pass over the rows."""
+        return self.matcher.match_series(texts)
+
+    def repetition_stats(self, text):
         words = text.lower().split()
-        return any(words.count(w) > 5 for w in set(words))
+        if not words:
+            return False, None, 0.0
+        token, count = Counter(words).most_common(1)[0]
+        return count > self.max_word_repeats, token, count / len(words)
+
+    def check_repetition(self, text):
+        return self.repetition_stats(text)[0]
+
+    def check_repetition_batch(self, texts):
+        """Repetition flag, most repeated token and its share of the review, one chunk at a time."""
+        frames = [self._repetition_chunk(chunk) for chunk in self._iter_chunks(texts)]
+        if not frames:
+            return self._repetition_chunk(texts)
+        return pd.concat(frames)
+
+    def _repetition_chunk(self, texts):
+        # a Counter per row beats exploding the chunk into one row per word and grouping
+        stats = [self.repetition_stats(text) for text in texts.fillna("").astype(str)]
+        return pd.DataFrame(
+            stats or None,
+            columns=["violation_repetition", "repetition_top_token", "repetition_ratio"],
+            index=texts.index,
+        ).astype({"violation_repetition": bool, "repetition_top_token": object, "repetition_ratio": float})
 
     def check_low_quality(self, text):
         return len(text.split()) < self.min_length
 
     def check_rating_mismatch(self, text, rating):
-        sentiment = TextBlob(text).sentiment.polarity
-        return (rating >= 4 and sentiment < -0.2) or (rating <= 2 and sentiment > 0.2)
+        polarity, _ = sentiment(text)
+        t = self.rating_thresholds
+        return (rating >= t["high_rating"] and polarity < -t["polarity"]) or (rating <= t["low_rating"] and polarity > t["polarity"])
+
+    def check_rating_mismatch_batch(self, df):
+        """Vectorized rating mismatch that reuses `sentiment_polarity` from feature engineering when present."""
+        if self.sentiment_col in df.columns:
+            polarity = pd.to_numeric(df[self.sentiment_col], errors="coerce")
+        else:
+            polarity = pd.Series(float("nan"), index=df.index)
+        missing = polarity.isna()
+        if missing.any():
+            polarity = polarity.copy()
+            polarity[missing] = sentiment_frame(df.loc[missing, "text_en"])["sentiment_polarity"]
+        rating = pd.to_numeric(df["rating"], errors="coerce")
+        t = self.rating_thresholds
+        return ((rating >= t["high_rating"]) & (polarity < -t["polarity"])) | ((rating <= t["low_rating"]) & (polarity > t["polarity"]))
 
     def check_duplicates(self, df):
-        return df.duplicated(subset=["user_name", "text"], keep=False)
+        return self.check_duplicates_with_clusters(df)[0]
+
+    def check_duplicates_with_clusters(self, df):
+        """Exact (user_name, text) repeats plus MinHash-LSH near-duplicates of text_en.
+
+        Reviews with fewer shingles than the index's min_shingles only count as exact repeats.
+        Returns the duplicate flags and the near-duplicate cluster id of every row (-1 if none).
+        """
+        exact = df.duplicated(subset=["user_name", "text"], keep=False)
+        if self._exact_seen is not None:
+            # streaming: also catch repeats of rows from earlier chunks
+            hashes = [
+                hashlib.sha1(f"{user}\x1f{text}".encode("utf-8")).digest()
+                for user, text in zip(df["user_name"].astype(str), df["text"].astype(str))
+            ]
+            exact |= pd.Series([h in self._exact_seen for h in hashes], index=df.index)
+            self._exact_seen.update(hashes)
+        if not self.near_duplicates:
+            return exact, pd.Series(-1, index=df.index)
+
+        index = self.duplicate_index
+        if index is None:
+            index = NearDuplicateIndex(threshold=self.duplicate_threshold)
+        flags, clusters = index.check(self._duplicate_keys(df), df["text_en"].fillna("").astype(str))
+        near = pd.Series(flags, index=df.index, dtype=bool)
+        return exact | near, pd.Series(clusters, index=df.index)
+
+    def _duplicate_keys(self, df):
+        if "review_id" in df.columns:
+            return df["review_id"].astype(str).tolist()
+        # without review ids, the author plus the text identifies a review
+        return [
+            hashlib.sha1(f"{user}\x1f{text}".encode("utf-8")).hexdigest()
+            for user, text in zip(df["user_name"].astype(str), df["text_en"].astype(str))
+        ]
 
     # ---------------- ML-Based Checks ----------------
 
     def check_irrelevant_ml(self, text):
-        if self.relevance_model:
+        if self.relevance_model and "irrelevant" in self.zero_shot_policies:
             if self.use_zero_shot:
-                result = self.relevance_model(text, candidate_labels=["relevant", "irrelevant"])
-                return result["labels"][0] == "irrelevant"
+                labels, positive = self.zero_shot_policies["irrelevant"]
+                result = self.relevance_model(text, candidate_labels=labels)
+                return result["labels"][0] == positive
             else:
                 return self.relevance_model.predict([text])[0] == 0  # 0 = irrelevant
         return False
 
     def check_rant_without_visit(self, text):
-        rule_flag = any(kw in text.lower() for kw in self.rant_keywords)
-        if self.rant_model:
+        rule_flag = self.check_rant_without_visit_rule(text)
+        if self.rant_model and "rant_without_visit" in self.zero_shot_policies:
             if self.use_zero_shot:
-                result = self.rant_model(text, candidate_labels=["factual", "speculative"])
-                ml_flag = result["labels"][0] == "speculative"
+                labels, positive = self.zero_shot_policies["rant_without_visit"]
+                result = self.rant_model(text, candidate_labels=labels)
+                ml_flag = result["labels"][0] == positive
             else:
                 ml_flag = self.rant_model.predict([text])[0] == 1  # 1 = speculative
         else:
             ml_flag = False
         return rule_flag or ml_flag
 
+    # ---------------- Batched ML Checks ----------------
+
+    def _iter_chunks(self, texts):
+        size = self.chunk_size or len(texts) or 1
+        for start in range(0, len(texts), size):
+            if isinstance(texts, pd.Series):
+                yield texts.iloc[start:start + size]
+            else:
+                yield texts[start:start + size]
+
+    def _token_lengths(self, model, texts):
+        tokenizer = getattr(model, "tokenizer", None)
+        if tokenizer is None:
+            return [len(text.split()) for text in texts]
+        return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+    def _token_budget(self, model, candidate_labels):
+        """Review tokens that fit in one NLI pair, or None when nothing needs windowing.
+
+        Defaults to the tokenizer's model_max_length (1024 for bart-large-mnli) less the
+        longest hypothesis and the pair's special tokens, so only reviews the model would
+        truncate are windowed.
+        """
+        if self.max_tokens is not None:
+            return self.max_tokens
+        tokenizer = getattr(model, "tokenizer", None)
+        limit = getattr(tokenizer, "model_max_length", None)
+        # tokenizers without a known limit report a huge sentinel value
+        if not limit or limit > 100_000:
+            return None
+        hypotheses = [HYPOTHESIS_TEMPLATE.format(label) for label in candidate_labels]
+        hypothesis_tokens = max(len(ids) for ids in tokenizer(hypotheses, add_special_tokens=False)["input_ids"])
+        return limit - hypothesis_tokens - tokenizer.num_special_tokens_to_add(pair=True)
+
+    def _windows(self, text, n_tokens, max_tokens):
+        """Splits a review longer than max_tokens into roughly equal word windows."""
+        if max_tokens is None or n_tokens <= max_tokens:
+            return [text]
+        words = text.split()
+        n_windows = -(-n_tokens // max_tokens)
+        step = -(-len(words) // n_windows)
+        return [" ".join(words[i:i + step]) for i in range(0, len(words), step)] or [text]
+
+    def _zero_shot_scores(self, model, texts, candidate_labels):
+        """Label -> score for every text, in input order.
+
+        Long reviews are split into windows whose scores are averaged, and all windows
+        are fed to the model sorted by token length so each batch pads to its own bucket.
+        """
+        texts = [str(text) for text in texts]
+        if not texts:
+            return []
+        max_tokens = self._token_budget(model, candidate_labels)
+        segments, owners, lengths = [], [], []
+        for i, (text, n_tokens) in enumerate(zip(texts, self._token_lengths(model, texts))):
+            windows = self._windows(text, n_tokens, max_tokens)
+            for window in windows:
+                segments.append(window)
+                owners.append(i)
+                lengths.append(n_tokens // len(windows))
+
+        order = list(range(len(segments)))
+        if self.length_bucketing:
+            order.sort(key=lambda j: lengths[j])
+
+        totals = [dict.fromkeys(candidate_labels, 0.0) for _ in texts]
+        counts = [0] * len(texts)
+        for bucket in self._iter_chunks(order):
+            results = model([segments[j] for j in bucket], candidate_labels=candidate_labels, batch_size=self.batch_size)
+            if isinstance(results, dict):
+                results = [results]
+            for j, r in zip(bucket, results):
+                owner = owners[j]
+                counts[owner] += 1
+                for label, score in zip(r["labels"], r["scores"]):
+                    totals[owner][label] += score
+        return [{label: total / counts[i] for label, total in scores.items()} for i, scores in enumerate(totals)]
+
+    def _zero_shot_top_labels(self, model, texts, candidate_labels):
+        # ties resolve to the first candidate label
+        return [
+            max(candidate_labels, key=lambda label: scores[label])
+            for scores in self._zero_shot_scores(model, texts, candidate_labels)
+        ]
+
+    def _predict_batch(self, model, texts):
+        preds = []
+        for chunk in self._iter_chunks(texts):
+            preds.extend(model.predict(chunk))
+        return preds
+
+    def check_irrelevant_ml_batch(self, texts):
+        texts = list(texts)
+        if not self.relevance_model or not texts or "irrelevant" not in self.zero_shot_policies:
+            return [False] * len(texts)
+        if self.use_zero_shot:
+            labels, positive = self.zero_shot_policies["irrelevant"]
+            top = self._zero_shot_top_labels(self.relevance_model, texts, labels)
+            return [label == positive for label in top]
+        return [pred == 0 for pred in self._predict_batch(self.relevance_model, texts)]  # 0 = irrelevant
+
+    def check_rant_without_visit_batch(self, texts, ml_flags=None, rule_flags=None):
+        texts = list(texts)
+        if rule_flags is None:
+            rule_flags = [self.check_rant_without_visit_rule(text) for text in texts]
+        rule_flags = list(rule_flags)
+        if ml_flags is None:
+            if not self.rant_model or not texts or "rant_without_visit" not in self.zero_shot_policies:
+                return rule_flags
+            if self.use_zero_shot:
+                labels, positive = self.zero_shot_policies["rant_without_visit"]
+                top = self._zero_shot_top_labels(self.rant_model, texts, labels)
+                ml_flags = [label == positive for label in top]
+            else:
+                ml_flags = [pred == 1 for pred in self._predict_batch(self.rant_model, texts)]  # 1 = speculative
+        return [rule or ml for rule, ml in zip(rule_flags, ml_flags)]
+
+    def check_zero_shot_multi(self, texts, policies=None, model=None):
+        """Scores the hypotheses of several ML policies in one pipeline pass per chunk.
+
+        The pipeline softmaxes entailment logits over all candidate labels, which
+        keeps their order, so the per-policy argmax matches the two-pass verdicts.
+        Defaults to every model policy on `relevance_model`.
+        """
+        texts = list(texts)
+        policies = {name: self.zero_shot_policies[name] for name in (policies or self.zero_shot_policies)}
+        model = model or self.relevance_model
+        flags = {policy: [] for policy in policies}
+        if not texts:
+            return flags
+        all_labels = list(dict.fromkeys(label for labels, _ in policies.values() for label in labels))
+        for scores in self._zero_shot_scores(model, texts, all_labels):
+            for policy, (labels, positive) in policies.items():
+                # ties resolve to the first label, as in the single-policy pass
+                flags[policy].append(max(labels, key=lambda l: scores[l]) == positive)
+        return flags
+
+    def check_ml_flags_batch(self, texts):
+        """ML verdicts per policy (keyword rules not included)."""
+        texts = list(texts)
+        if self.use_zero_shot and self.distilled_models:
+            return self._check_ml_distilled(texts)
+        return self._check_ml_teacher(texts)
+
+    def _check_ml_teacher(self, texts):
+        shared = self.relevance_model is not None and self.relevance_model is self.rant_model
+        flags = {}
+        if self.use_zero_shot and self.multi_hypothesis and shared:
+            # one multi-hypothesis pass per backbone, however many policies share it
+            for backbone, policies in self.plan.backbones.items():
+                flags.update(self.check_zero_shot_multi(texts, policies, self._backbone_model(backbone)))
+            return flags
+
+        if "irrelevant" in self.zero_shot_policies:
+            flags["irrelevant"] = self.check_irrelevant_ml_batch(texts)
+        if "rant_without_visit" in self.zero_shot_policies:
+            flags["rant_without_visit"] = self.check_rant_without_visit_batch(texts, rule_flags=[False] * len(texts))
+        for policy in self.zero_shot_policies:
+            if policy not in flags:
+                flags[policy] = self._check_configured_policy(texts, policy)
+        return flags
+
+    def _check_configured_policy(self, texts, policy):
+        if not self.use_zero_shot:
+            return [False] * len(texts)
+        model = self._backbone_model(self.plan.backbone_of(policy))
+        return self.check_zero_shot_multi(texts, [policy], model)[policy]
+
+    def _backbone_model(self, backbone):
+        # the default backbone is whatever relevance_model holds (the registry's model or the caller's)
+        if backbone == ZERO_SHOT_MODEL and self.relevance_model is not None:
+            return self.relevance_model
+        name = f"zero_shot:{backbone}"
+        if name not in registry:
+            registry.register(name, functools.partial(load_zero_shot, backbone))
+        return registry.get(name)
+
+    def _check_ml_distilled(self, texts):
+        """Distilled classifiers settle confident rows; low-margin rows escalate to the zero-shot teacher."""
+        flags = {policy: [False] * len(texts) for policy in self.zero_shot_policies}
+        escalate = [False] * len(texts)
+        for policy in self.zero_shot_policies:
+            model = self.distilled_models.get(policy)
+            if model is None:
+                escalate = [True] * len(texts)
+                continue
+            if not texts:
+                continue
+            proba = model.predict_proba(texts)[:, list(model.classes_).index(1)]
+            for i, p in enumerate(proba):
+                flags[policy][i] = bool(p >= 0.5)
+                if max(p, 1 - p) < self.distill_threshold:
+                    escalate[i] = True
+
+        escalated = [i for i, e in enumerate(escalate) if e]
+        self._record_stage("zero_shot", len(escalated))
+        if escalated:
+            teacher = self._check_ml_teacher([texts[i] for i in escalated])
+            for policy, teacher_flags in teacher.items():
+                for i, flag in zip(escalated, teacher_flags):
+                    flags[policy][i] = flag
+        if texts:
+            print(f"🎓 Distilled gate: {len(escalated)}/{len(texts)} rows escalated to zero-shot "
+                  f"({len(escalated) / len(texts):.1%})")
+        return flags
+
+    def check_ml_batch(self, texts, rule_flags=None):
+        """violation_* columns of every model policy, OR-ed with the policy's keyword rule.
+
+        `rule_flags` maps a policy to precomputed rule hits; missing ones are scanned here.
+        """
+        texts = list(texts)
+        rule_flags = dict(rule_flags or {})
+        ml = self.check_ml_flags_batch(texts)
+        out = {}
+        for policy, ml_flags in ml.items():
+            rules = rule_flags.get(policy)
+            if rules is None and policy in self.plan.rules:
+                rules = [policy in self.matcher.match(text) for text in texts]
+            out[f"violation_{policy}"] = ml_flags if rules is None else [r or m for r, m in zip(rules, ml_flags)]
+        return out
+
 
     # ---------------- Enforcement ----------------
 
-    def enforce(self, df):
-        df["violation_profanity"] = df["text_en"].apply(self.check_profanity)
-        df["violation_advertisement"] = df["text_en"].apply(self.check_advertisement)
-        df["violation_repetition"] = df["text_en"].apply(self.check_repetition)
-        df["violation_low_quality"] = df["text_en"].apply(self.check_low_quality)
-        df["violation_rating_mismatch"] = df.apply(
-            lambda row: self.check_rating_mismatch(row["text_en"], row["rating"]), axis=1
-        )
-        df["violation_duplicate"] = self.check_duplicates(df)
-        df["violation_irrelevant"] = df["text_en"].apply(self.check_irrelevant_ml)
-        df["violation_rant_without_visit"] = df["text_en"].apply(self.check_rant_without_visit)
+    def enforce(self, df, batched=True, full_label=None):
+        """Adds every violation_* column plus has_violation to `df`.
+
+        In cascade mode `full_label` (True or a boolean mask over `df`) marks rows that
+        must still go through every stage even when a cheaper check already flagged them.
+        """
+        self.refresh_policies()
+        self.stage_counts = {}
+        if full_label is not None:
+            full_label = pd.Series(full_label, index=df.index).astype(bool)
+        if self.cache is None:
+            self._apply_row_checks(df, batched, full_label)
+        else:
+            self._apply_row_checks_cached(df, batched, full_label)
+        if self.cascade:
+            stages = ", ".join(f"{k}={v}" for k, v in self.stage_counts.items()) or "all rows served from cache"
+            print(f"🪜 Cascade rows per stage: {stages}")
+
+        # Duplicates depend on the whole frame, so they are never cached
+        duplicates, clusters = self.check_duplicates_with_clusters(df)
+        # an already enforced frame (e.g. a re-run over enforced_reviews.csv) has both columns
+        df.drop(columns=["violation_duplicate", "duplicate_cluster_id"], errors="ignore", inplace=True)
+        position = df.columns.get_loc("violation_rating_mismatch") + 1
+        df.insert(position, "violation_duplicate", duplicates)
+        df.insert(position + 1, "duplicate_cluster_id", clusters)
 
         # Final flag
         violation_cols = [c for c in df.columns if c.startswith("violation_")]
         df["has_violation"] = df[violation_cols].any(axis=1)
 
         return df
-    
+
+    def enforce_iter(self, chunks, duplicate_window=STREAM_WINDOW, **kwargs):
+        """Streams `enforce` over an iterable of review chunks, yielding each enforced chunk.
+
+        Chunks can be DataFrames (e.g. `pd.read_csv(..., chunksize=n)`) or lists of
+        records (e.g. Mongo cursor batches), and each is yielded before the next is
+        read. Duplicate tracking carries over, so a review repeating one from an
+        earlier chunk is flagged (the earlier, already-yielded row is not revisited).
+        That state is not bounded by the chunk size: a 20-byte digest of every
+        (user_name, text) pair seen (about 100 bytes per review), plus a near-duplicate
+        index over the newest `duplicate_window` reviews (about 3 KB each; None keeps
+        every review). A supplied `duplicate_index` is used as is.
+        """
+        previous_index = self.duplicate_index
+        if self.near_duplicates and self.duplicate_index is None:
+            self.duplicate_index = NearDuplicateIndex(threshold=self.duplicate_threshold, max_documents=duplicate_window)
+        self._exact_seen = set()
+        try:
+            for chunk in chunks:
+                if not isinstance(chunk, pd.DataFrame):
+                    chunk = pd.DataFrame(list(chunk))
+                if chunk.empty:
+                    continue
+                yield self.enforce(chunk, **kwargs)
+        finally:
+            self._exact_seen = None
+            self.duplicate_index = previous_index
+
+    def _apply_row_checks(self, df, batched=True, full_label=None):
+        """Writes every verdict that depends only on the row itself (all of row_verdict_columns)."""
+        if self.workers > 1 and len(df) > self.parallel_chunk_rows:
+            rules = self._rule_verdicts_parallel(df)
+        else:
+            rules = self.rule_verdicts(df, batched)
+        for col in self.rule_verdict_columns:
+            df[col] = rules[col]
+        # keyword halves of model policies, e.g. "never been" for rant_without_visit
+        rule_halves = {
+            policy: rules[f"{policy}_rule"].astype(bool)
+            for policy in self.zero_shot_policies if f"{policy}_rule" in rules
+        }
+
+        # Cascade: the ML stage only sees rows the cheap rules left unflagged
+        ml_rows = pd.Series(True, index=df.index)
+        if self.cascade:
+            rule_cols = [c for c in self.rule_verdict_columns if c.startswith("violation_")]
+            flagged = df[rule_cols].any(axis=1)
+            for hits in rule_halves.values():
+                flagged |= hits
+            ml_rows = ~flagged
+            if full_label is not None:
+                ml_rows |= full_label
+        self._record_stage("rules", len(df))
+        self._record_stage(self.ml_stage, int(ml_rows.sum()))
+        self.last_ml_rows = ml_rows
+
+        for policy in self.zero_shot_policies:
+            df[f"violation_{policy}"] = rule_halves[policy] if policy in rule_halves else False
+        if ml_rows.any():
+            self._apply_ml_checks(df, ml_rows, rule_halves, batched)
+        return df
+
+    def rule_verdicts(self, df, batched=True):
+        """Rule and sentiment verdicts for `df` as a new frame; `df` itself is left untouched."""
+        out = pd.DataFrame(index=df.index)
+        if batched:
+            rule_hits = self.check_rules_batch(df["text_en"])
+        else:
+            matches = df["text_en"].apply(self.matcher.match)
+            rule_hits = pd.DataFrame({group: matches.apply(lambda m, g=group: g in m) for group in self.matcher.groups}, index=df.index)
+        for name in self.plan.rule_policies:
+            out[f"violation_{name}"] = rule_hits[name] if name in rule_hits else False
+        if batched:
+            repetition = self.check_repetition_batch(df["text_en"])
+        else:
+            repetition = pd.DataFrame(
+                df["text_en"].apply(self.repetition_stats).tolist(),
+                columns=["violation_repetition", "repetition_top_token", "repetition_ratio"],
+                index=df.index,
+            )
+        out["violation_repetition"] = repetition["violation_repetition"].astype(bool)
+        out["repetition_top_token"] = repetition["repetition_top_token"]
+        out["repetition_ratio"] = repetition["repetition_ratio"].astype(float)
+        out["violation_low_quality"] = df["text_en"].apply(self.check_low_quality)
+        if batched:
+            out["violation_rating_mismatch"] = self.check_rating_mismatch_batch(df)
+        else:
+            out["violation_rating_mismatch"] = df.apply(
+                lambda row: self.check_rating_mismatch(row["text_en"], row["rating"]), axis=1
+            )
+        for policy in self.zero_shot_policies:
+            if policy in rule_hits:
+                out[f"{policy}_rule"] = rule_hits[policy]
+        return out
+
+    def _rule_verdicts_parallel(self, df):
+        columns = [c for c in ("text_en", "rating", self.sentiment_col) if c in df.columns]
+        chunks = [
+            df[columns].iloc[start:start + self.parallel_chunk_rows]
+            for start in range(0, len(df), self.parallel_chunk_rows)
+        ]
+        rules_only = self._rules_only()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            parts = list(pool.map(_rule_verdicts_worker, [rules_only] * len(chunks), chunks))
+        return pd.concat(parts)
+
+    def _rules_only(self):
+        """A picklable copy carrying just the rule configuration, for worker processes."""
+        clone = copy.copy(self)
+        clone.relevance_model = clone.rant_model = None
+        clone.cache = clone.duplicate_index = clone._exact_seen = None
+        clone.distilled_models = {}
+        clone.workers = 1
+        return clone
+
+    def enforce_parallel(self, df, workers=None, chunk_rows=None, **kwargs):
+        """`enforce` with the rule and sentiment checks fanned out over a process pool.
+
+        ML checks and duplicate detection still run over the whole frame in this
+        process, so the output is identical to the serial `enforce`.
+        """
+        previous = self.workers, self.parallel_chunk_rows
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_chunk_rows = chunk_rows or self.parallel_chunk_rows
+        try:
+            return self.enforce(df, **kwargs)
+        finally:
+            self.workers, self.parallel_chunk_rows = previous
+
+    def _apply_ml_checks(self, df, rows, rule_halves, batched=True):
+        index = df.index[rows.to_numpy()]
+        texts = df.loc[index, "text_en"]
+        if batched:
+            rule_flags = {policy: hits.loc[index].tolist() for policy, hits in rule_halves.items()}
+            for col, flags in self.check_ml_batch(texts.tolist(), rule_flags=rule_flags).items():
+                df.loc[index, col] = flags
+            return
+
+        per_row = {"irrelevant": self.check_irrelevant_ml, "rant_without_visit": self.check_rant_without_visit}
+        for policy in self.zero_shot_policies:
+            if policy in per_row:
+                df.loc[index, f"violation_{policy}"] = texts.apply(per_row[policy]).astype(bool)
+            else:
+                ml_flags = self._check_configured_policy(texts.tolist(), policy)
+                rules = rule_halves[policy].loc[index].tolist() if policy in rule_halves else [False] * len(index)
+                df.loc[index, f"violation_{policy}"] = [r or m for r, m in zip(rules, ml_flags)]
+
+    @property
+    def ml_stage(self):
+        if self.use_zero_shot and self.distilled_models:
+            return "distilled"
+        return "zero_shot" if self.use_zero_shot else "classical"
+
+    def _record_stage(self, stage, rows):
+        self.stage_counts[stage] = self.stage_counts.get(stage, 0) + rows
+
+    def _apply_row_checks_cached(self, df, batched=True, full_label=None):
+        keys = [
+            self.cache.make_key(text, rating, self.model_id, self.policy_version)
+            for text, rating in zip(df["text_en"], df["rating"])
+        ]
+        cached = self.cache.get_many(keys)
+        missing = pd.Series([key not in cached for key in keys], index=df.index)
+        if full_label is not None:
+            # cascaded entries that skipped the ML stage cannot answer a full-label request
+            partial = pd.Series([not cached.get(key, {}).get("ml_checked", True) for key in keys], index=df.index)
+            missing |= partial & full_label
+
+        fresh = {}
+        if missing.any():
+            todo = self._apply_row_checks(
+                df.loc[missing].copy(), batched, None if full_label is None else full_label.loc[missing]
+            )
+            ml_checked = self.last_ml_rows
+            for key, (idx, row) in zip([k for k, m in zip(keys, missing) if m], todo[self.row_verdict_columns].iterrows()):
+                fresh[key] = {
+                    col: (None if pd.isna(value) else value.item() if hasattr(value, "item") else value)
+                    for col, value in row.items()
+                }
+                fresh[key]["ml_checked"] = bool(ml_checked.loc[idx])
+            self.cache.put_many(fresh)
+
+        verdicts = [fresh.get(key) or cached[key] for key in keys]
+        for col in self.row_verdict_columns:
+            df[col] = [v[col] for v in verdicts]
+        for col in self.row_verdict_columns:
+            if col.startswith("violation_"):
+                df[col] = df[col].astype(bool)
+        df["repetition_ratio"] = df["repetition_ratio"].astype(float)
+
+        stats = self.cache.stats()
+        print(f"🗄️ Verdict cache: {len(keys) - int(missing.sum())} hits, {int(missing.sum())} misses "
+              f"({stats['entries']} entries, lifetime hit rate {stats['hit_rate']:.0%})")
+        return df
+
+    # ---------------- Cache Identity ----------------
+
+    @property
+    def model_id(self):
+        def describe(model):
+            if model is None:
+                return "none"
+            inner = getattr(model, "model", None)
+            name = getattr(inner, "name_or_path", None) or type(model).__name__
+            backend = getattr(model, "backend", None)
+            return f"{name}@{backend}" if backend else name
+
+        mode = "zero_shot" if self.use_zero_shot else "predict"
+        if self.cascade:
+            # cascaded verdicts leave ML columns unset on rule-flagged rows
+            mode += "+cascade"
+        if self.use_zero_shot and self.distilled_models:
+            versions = ",".join(
+                f"{policy}={getattr(model, 'distilled_at', 'unknown')}" for policy, model in sorted(self.distilled_models.items())
+            )
+            mode += f"+distilled({versions})@{self.distill_threshold}"
+        return f"{mode}:{describe(self.relevance_model)}:{describe(self.rant_model)}"
+
+    @property
+    def policy_version(self):
+        # the config version/hash, plus constructor overrides that change verdicts
+        overrides = json.dumps({"min_length": self.min_length}, sort_keys=True)
+        return f"{self.plan.version}-{hashlib.sha256(overrides.encode('utf-8')).hexdigest()[:8]}"
+
     # def enforce_with_llm(self, df):
     #     violations_data = []
 
@@ -122,3 +738,19 @@ class PolicyEnforcer:
     #     )
 
     #     return df
+
+
+def iter_record_batches(records, batch_size=10_000):
+    """Groups an iterable of dict records (e.g. a Mongo cursor) into DataFrame chunks."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+def _rule_verdicts_worker(enforcer, chunk):
+    return enforcer.rule_verdicts(chunk, batched=True)
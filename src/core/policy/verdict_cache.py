@@ -0,0 +1,33 @@
+import hashlib
+import json
+import math
+
+from src.data.sqlite_store import LRUCache, normalize_text
+
+DEFAULT_CACHE_PATH = "src/data/processed/verdict_cache.sqlite"
+
+
+class VerdictCache(LRUCache):
+    """SQLite-backed store of per-review verdicts, keyed by content rather than row id.
+
+    Entries are evicted least-recently-used once `max_entries` is exceeded.
+    """
+
+    table = "verdicts"
+    value_column = "verdict"
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=500_000):
+        super().__init__(path, max_entries)
+
+    @staticmethod
+    def make_key(text, rating, model_id, policy_version) -> str:
+        if rating is None or (isinstance(rating, float) and math.isnan(rating)):
+            rating = ""
+        payload = "\x1f".join([normalize_text(text), str(rating), str(model_id), str(policy_version)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _encode(self, verdict):
+        return json.dumps(verdict)
+
+    def _decode(self, stored):
+        return json.loads(stored)